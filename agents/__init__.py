@@ -1,15 +1,90 @@
-from agents.news_agent import NewsAgent
-from agents.papers_agent import PapersAgent
-from agents.grants_agent import GrantsAgent
-from agents.funding_agent import FundingAgent
-from agents.github_agent import GitHubAgent
-
-ALL_AGENTS = {
-    "news": NewsAgent,
-    "papers": PapersAgent,
-    "grants": GrantsAgent,
-    "funding": FundingAgent,
-    "github": GitHubAgent,
+"""Agent registry.
+
+ALL_AGENTS maps agent names to agent classes, importing each agent's module
+(and its parsing dependencies) only when that agent is first looked up.
+Third-party agents register under the ENTRY_POINT_GROUP entry-point group,
+e.g. in their pyproject.toml:
+
+    [project.entry-points."personal_ai_assistant.agents"]
+    hackernews = "hn_agent:HackerNewsAgent"
+
+Built-in names take precedence over plugins.
+"""
+import importlib
+from collections.abc import Iterator, Mapping
+
+ENTRY_POINT_GROUP = "personal_ai_assistant.agents"
+
+# Built-in agents: name -> "module:ClassName"
+BUILTIN_AGENTS = {
+    "news": "agents.news_agent:NewsAgent",
+    "papers": "agents.papers_agent:PapersAgent",
+    "grants": "agents.grants_agent:GrantsAgent",
+    "funding": "agents.funding_agent:FundingAgent",
+    "github": "agents.github_agent:GitHubAgent",
 }
 
+
+def _load(spec) -> type:
+    if not isinstance(spec, str):
+        return spec.load()  # importlib.metadata.EntryPoint
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class AgentRegistry(Mapping):
+    """Read-only name -> agent class mapping with lazily imported entries.
+
+    Looking up a name imports only that agent's module. Iterating (or a
+    lookup that misses the built-ins) also discovers entry-point plugins,
+    which are loaded individually when they are looked up.
+    """
+
+    def __init__(self, builtins: dict[str, str]):
+        self._specs: dict = dict(builtins)
+        self._classes: dict[str, type] = {}
+        self._discovered = False
+
+    def _discover(self):
+        if self._discovered:
+            return
+        self._discovered = True
+        from importlib.metadata import entry_points
+
+        for ep in entry_points(group=ENTRY_POINT_GROUP):
+            self._specs.setdefault(ep.name, ep)
+
+    def __getitem__(self, name: str) -> type:
+        agent_cls = self._classes.get(name)
+        if agent_cls is None:
+            if name not in self._specs:
+                self._discover()
+            agent_cls = self._classes[name] = _load(self._specs[name])
+        return agent_cls
+
+    def __contains__(self, name) -> bool:
+        if name not in self._specs:
+            self._discover()
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        return iter(list(self._specs))
+
+    def __len__(self) -> int:
+        self._discover()
+        return len(self._specs)
+
+
+ALL_AGENTS = AgentRegistry(BUILTIN_AGENTS)
+
 COLLECTIBLE_AGENTS = ALL_AGENTS
+
+# `from agents import NewsAgent` keeps working, resolved through the registry
+_CLASS_NAMES = {spec.rpartition(":")[2]: name for name, spec in BUILTIN_AGENTS.items()}
+
+
+def __getattr__(attr: str):
+    if attr in _CLASS_NAMES:
+        return ALL_AGENTS[_CLASS_NAMES[attr]]
+    raise AttributeError(f"module 'agents' has no attribute {attr!r}")
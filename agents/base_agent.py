@@ -1,19 +1,72 @@
 import abc
+import time
 from datetime import datetime
 
+import metrics
 import storage
 
 
 class BaseAgent(abc.ABC):
     """Base class for all collection agents."""
 
+    # Wording for the progress lines, e.g. "3 fetched, 1 new" / "5 new papers added."
+    count_label = "found"
+    item_noun = "items"
+
     @abc.abstractmethod
     def get_agent_name(self) -> str:
         """Return the agent identifier (e.g. 'news', 'papers')."""
 
     @abc.abstractmethod
-    def collect(self) -> int:
+    def get_sources(self) -> list[dict]:
+        """Return the sources to poll. Each source has at least 'name' and 'url'."""
+
+    @abc.abstractmethod
+    def parse_source(self, source: dict, body: bytes) -> list[dict]:
+        """Parse the downloaded body of a single source into item dicts."""
+
+    def parse_with_metrics(self, source: dict, body: bytes) -> tuple[list[dict], dict]:
+        """parse_source() plus its parse time and the items it dropped, by reason."""
+        with metrics.parse_scope() as skipped:
+            start = time.perf_counter()
+            items = self.parse_source(source, body)
+            elapsed = time.perf_counter() - start
+        return items, {"parse_seconds": elapsed, "skipped": skipped}
+
+    async def fetch_source(self, fetcher, source: dict):
+        """Download one source through the shared, pooled fetcher."""
+        return await fetcher.fetch(source["url"], budget=source.get("budget"), agent_name=self.get_agent_name())
+
+    def collect(self, workers: int | None = None, parse_workers: int | None = None) -> int:
         """Run a collection pass. Returns count of new items added."""
+        import collector
+
+        return collector.run_agents([self], workers, parse_workers)
+
+    def log_start(self):
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {type(self).__name__}: starting collection...")
+
+    def log_done(self, total_new: int):
+        print(f"{type(self).__name__}: {total_new} new {self.item_noun} added.")
+
+    def store_batch(self, batch: list[tuple[dict, list[dict]]]) -> int:
+        """Store several sources' items with one storage write and print their
+        progress line. Returns count added."""
+        names = ", ".join(source["name"] for source, _ in batch)
+        items = [item for _, source_items in batch for item in source_items]
+        if not items:
+            print(f"  {names}: 0 {self.count_label}")
+            return 0
+        added = self.add_items(items)
+        print(f"  {names}: {len(items)} {self.count_label}, {added} new")
+        return added
+
+    def seen_before(self, link: str) -> bool:
+        """True if this agent already collected the link on an earlier day."""
+        if storage.seen_before(self.get_agent_name(), link):
+            metrics.count("seen")
+            return True
+        return False
 
     def get_data_dir(self) -> str:
         return storage.agent_data_dir(self.get_agent_name())
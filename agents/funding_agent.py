@@ -1,18 +1,11 @@
-import time
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 
-import requests
-from bs4 import BeautifulSoup
-
 import config
-import storage
+import metrics
 from agents.base_agent import BaseAgent
-
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-}
-TIMEOUT = 15
+from htmlextract import iter_anchors
+from keywords import KeywordMatcher
 
 # Only keep links that strongly indicate an active funding/program opportunity
 STRONG_INDICATORS = [
@@ -33,48 +26,35 @@ NOISE_WORDS = [
     "career", "job", "hiring",
 ]
 
+# Prefix matching keeps stems like "incubat" working without "team" firing inside "steam"
+STRONG_MATCHER = KeywordMatcher(STRONG_INDICATORS, boundary="prefix")
+NOISE_MATCHER = KeywordMatcher(NOISE_WORDS, boundary="prefix")
+
 
 class FundingAgent(BaseAgent):
     """Tracks pre-seed, seed, and accelerator funding opportunities."""
 
+    item_noun = "funding opportunities"
+
     def get_agent_name(self) -> str:
         return "funding"
 
-    def collect(self) -> int:
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] FundingAgent: starting collection...")
-        total_new = 0
-        for source in config.FUNDING_SOURCES:
-            items = self._scrape_source(source)
-            if items:
-                added = self.add_items(items)
-                total_new += added
-                print(f"  {source['name']}: {len(items)} found, {added} new")
-            else:
-                print(f"  {source['name']}: 0 found")
-            time.sleep(2)
-
-        storage.cleanup_old_files("funding")
-        print(f"FundingAgent: {total_new} new funding opportunities added.")
-        return total_new
-
-    def _scrape_source(self, source: dict) -> list[dict]:
+    def get_sources(self) -> list[dict]:
+        return config.FUNDING_SOURCES
+
+    def parse_source(self, source: dict, body: bytes) -> list[dict]:
+        return self._scrape_source(source, body)
+
+    def _scrape_source(self, source: dict, body: bytes) -> list[dict]:
         name = source["name"]
         url = source["url"]
         funding_type = source["type"]
-        try:
-            resp = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            resp.raise_for_status()
-        except Exception as e:
-            print(f"  Error fetching {name}: {e}")
-            return []
-
-        soup = BeautifulSoup(resp.text, "lxml")
         items = []
         base = urlparse(url)
 
-        for a_tag in soup.find_all("a", href=True):
-            text = a_tag.get_text(strip=True)
-            href = a_tag["href"]
+        for anchor in iter_anchors(body):
+            text = anchor.text
+            href = anchor.href
             if not text or len(text) < 15 or len(text) > 200:
                 continue
 
@@ -84,18 +64,18 @@ class FundingAgent(BaseAgent):
                 else:
                     continue
 
-            text_lower = text.lower()
+            if self.seen_before(href):
+                continue
 
             # Skip noise
-            if any(w in text_lower for w in NOISE_WORDS):
+            if NOISE_MATCHER.matches(text):
                 continue
 
             # Only keep strong matches
-            if not any(w in text_lower for w in STRONG_INDICATORS):
+            if not STRONG_MATCHER.matches(text):
                 continue
 
-            parent = a_tag.parent
-            summary = parent.get_text(strip=True)[:250] if parent else ""
+            summary = anchor.parent_text(limit=250)
 
             items.append({
                 "title": text,
@@ -118,4 +98,6 @@ class FundingAgent(BaseAgent):
             seen_titles.add(norm_title)
             unique.append(item)
 
+        metrics.count("duplicate", len(items) - len(unique))
+        metrics.count("capped", max(0, len(unique) - 8))
         return unique[:8]  # Cap at 8 per source
@@ -1,56 +1,31 @@
 import re
-import time
 from datetime import datetime, timezone
 
-import requests
 from bs4 import BeautifulSoup
 
 import config
-import storage
 from agents.base_agent import BaseAgent
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-}
-TIMEOUT = 15
-
 
 class GitHubAgent(BaseAgent):
     """Fetches GitHub trending repos."""
 
+    item_noun = "repos"
+
     def get_agent_name(self) -> str:
         return "github"
 
-    def collect(self) -> int:
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] GitHubAgent: starting collection...")
-        total_new = 0
-
-        for label, url in [
-            ("GitHub Trending Daily", config.GITHUB_TRENDING_URL),
-            ("GitHub Trending Weekly", config.GITHUB_TRENDING_URL + "?since=weekly"),
-        ]:
-            repos = self._scrape_trending(url, label)
-            if repos:
-                added = self.add_items(repos)
-                total_new += added
-                print(f"  {label}: {len(repos)} found, {added} new")
-            else:
-                print(f"  {label}: 0 found")
-            time.sleep(2)
-
-        storage.cleanup_old_files("github")
-        print(f"GitHubAgent: {total_new} new repos added.")
-        return total_new
-
-    def _scrape_trending(self, url: str, label: str) -> list[dict]:
-        try:
-            resp = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            resp.raise_for_status()
-        except Exception as e:
-            print(f"  Error fetching {label}: {e}")
-            return []
-
-        soup = BeautifulSoup(resp.text, "lxml")
+    def get_sources(self) -> list[dict]:
+        return [
+            {"name": "GitHub Trending Daily", "url": config.GITHUB_TRENDING_URL},
+            {"name": "GitHub Trending Weekly", "url": config.GITHUB_TRENDING_URL + "?since=weekly"},
+        ]
+
+    def parse_source(self, source: dict, body: bytes) -> list[dict]:
+        return self._scrape_trending(body, source["name"])
+
+    def _scrape_trending(self, body: bytes, label: str) -> list[dict]:
+        soup = BeautifulSoup(body, "lxml")
         repos = []
 
         for article in soup.select("article.Box-row"):
@@ -60,6 +35,8 @@ class GitHubAgent(BaseAgent):
                 continue
             repo_name = h2.get_text(strip=True).replace(" ", "").replace("\n", "")
             link = "https://github.com" + h2["href"]
+            if self.seen_before(link):
+                continue
 
             # Description
             p = article.select_one("p")
@@ -1,19 +1,12 @@
 import re
-import time
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 
-import requests
-from bs4 import BeautifulSoup
-
 import config
-import storage
+import metrics
 from agents.base_agent import BaseAgent
-
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-}
-TIMEOUT = 15
+from htmlextract import iter_anchors
+from keywords import KeywordMatcher
 
 # Words that indicate the link is a real scheme/grant, not navigation noise
 STRONG_INDICATORS = [
@@ -36,6 +29,11 @@ NOISE_WORDS = [
     "explore", "menu", "navigation", "cookie",
 ]
 
+# Keywords match at the start of a word, so "scheme" also covers "schemes"
+# but "grant" no longer fires inside "immigrant"
+STRONG_MATCHER = KeywordMatcher(STRONG_INDICATORS, boundary="prefix")
+NOISE_MATCHER = KeywordMatcher(NOISE_WORDS, boundary="prefix")
+
 # Patterns that suggest an expired or date-passed deadline
 EXPIRED_PATTERNS = [
     r"closed", r"expired", r"deadline\s*:\s*\d{1,2}[/-]\d{1,2}[/-](2024|2023|2022|2021|2020)",
@@ -46,30 +44,20 @@ EXPIRED_PATTERNS = [
 class GrantsAgent(BaseAgent):
     """Scrapes government and institutional portals for active grant/scheme opportunities."""
 
+    item_noun = "grants"
+
     def get_agent_name(self) -> str:
         return "grants"
 
-    def collect(self) -> int:
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] GrantsAgent: starting collection...")
-        total_new = 0
-        for source in config.GRANT_SOURCES:
-            items = self._scrape_source(source)
-            if items:
-                added = self.add_items(items)
-                total_new += added
-                print(f"  {source['name']}: {len(items)} found, {added} new")
-            else:
-                print(f"  {source['name']}: 0 found")
-            time.sleep(2)
-
-        storage.cleanup_old_files("grants")
-        print(f"GrantsAgent: {total_new} new grants added.")
-        return total_new
+    def get_sources(self) -> list[dict]:
+        return config.GRANT_SOURCES
+
+    def parse_source(self, source: dict, body: bytes) -> list[dict]:
+        return self._scrape_source(source, body)
 
     @staticmethod
     def _is_noise(text: str) -> bool:
-        t = text.lower()
-        if any(w in t for w in NOISE_WORDS):
+        if NOISE_MATCHER.matches(text):
             return True
         if len(text.split()) < 3:
             return True
@@ -77,8 +65,7 @@ class GrantsAgent(BaseAgent):
 
     @staticmethod
     def _is_strong_match(text: str) -> bool:
-        t = text.lower()
-        return any(w in t for w in STRONG_INDICATORS)
+        return STRONG_MATCHER.matches(text)
 
     @staticmethod
     def _looks_expired(text: str) -> bool:
@@ -88,24 +75,16 @@ class GrantsAgent(BaseAgent):
                 return True
         return False
 
-    def _scrape_source(self, source: dict) -> list[dict]:
+    def _scrape_source(self, source: dict, body: bytes) -> list[dict]:
         name = source["name"]
         url = source["url"]
         region = source["region"]
-        try:
-            resp = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            resp.raise_for_status()
-        except Exception as e:
-            print(f"  Error fetching {name}: {e}")
-            return []
-
-        soup = BeautifulSoup(resp.text, "lxml")
         items = []
         base = urlparse(url)
 
-        for a_tag in soup.find_all("a", href=True):
-            text = a_tag.get_text(strip=True)
-            href = a_tag["href"]
+        for anchor in iter_anchors(body):
+            text = anchor.text
+            href = anchor.href
             if not text or len(text) < 15 or len(text) > 200:
                 continue
 
@@ -116,6 +95,10 @@ class GrantsAgent(BaseAgent):
                 else:
                     continue
 
+            # Already collected on an earlier day
+            if self.seen_before(href):
+                continue
+
             # Skip obvious noise
             if self._is_noise(text):
                 continue
@@ -125,8 +108,7 @@ class GrantsAgent(BaseAgent):
                 continue
 
             # Get surrounding context for summary
-            parent = a_tag.parent
-            context = parent.get_text(strip=True)[:250] if parent else ""
+            context = anchor.parent_text(limit=250)
 
             # Skip if context suggests expired
             if self._looks_expired(context):
@@ -154,4 +136,6 @@ class GrantsAgent(BaseAgent):
             seen_titles.add(norm_title)
             unique.append(item)
 
+        metrics.count("duplicate", len(items) - len(unique))
+        metrics.count("capped", max(0, len(unique) - 10))
         return unique[:10]  # Hard cap: only top 10 per source
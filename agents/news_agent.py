@@ -1,35 +1,26 @@
-import time
 from datetime import datetime, timedelta, timezone
 
 import feedparser
 
 import config
-import storage
+import metrics
 from agents.base_agent import BaseAgent
 
 
 class NewsAgent(BaseAgent):
     """Collects AI news from top-tier RSS feeds."""
 
+    count_label = "fetched"
+    item_noun = "articles"
+
     def get_agent_name(self) -> str:
         return "news"
 
-    def collect(self) -> int:
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] NewsAgent: starting collection...")
-        total_new = 0
-        for name, url in config.NEWS_FEEDS.items():
-            articles = self._fetch_feed(name, url)
-            if articles:
-                added = self.add_items(articles)
-                total_new += added
-                print(f"  {name}: {len(articles)} fetched, {added} new")
-            else:
-                print(f"  {name}: 0 fetched")
-            time.sleep(1)
-
-        storage.cleanup_old_files("news")
-        print(f"NewsAgent: {total_new} new articles added.")
-        return total_new
+    def get_sources(self) -> list[dict]:
+        return [{"name": name, "url": url} for name, url in config.NEWS_FEEDS.items()]
+
+    def parse_source(self, source: dict, body: bytes) -> list[dict]:
+        return self._fetch_feed(source["name"], body)
 
     @staticmethod
     def _parse_published(entry) -> datetime | None:
@@ -42,11 +33,11 @@ class NewsAgent(BaseAgent):
                     continue
         return None
 
-    def _fetch_feed(self, name: str, url: str) -> list[dict]:
+    def _fetch_feed(self, name: str, body: bytes) -> list[dict]:
         try:
-            feed = feedparser.parse(url)
+            feed = feedparser.parse(body)
         except Exception as e:
-            print(f"  Error fetching {name}: {e}")
+            print(f"  Error parsing {name}: {e}")
             return []
 
         cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
@@ -56,11 +47,12 @@ class NewsAgent(BaseAgent):
             title = entry.get("title", "").strip()
             link = entry.get("link", "").strip()
             summary = entry.get("summary", entry.get("description", "")).strip()
-            if not title or not link:
+            if not title or not link or self.seen_before(link):
                 continue
 
             published = self._parse_published(entry)
             if published and published < cutoff:
+                metrics.count("old")
                 continue
 
             if len(summary) > 500:
@@ -1,36 +1,31 @@
 import re
-import time
 from datetime import datetime, timedelta, timezone
 
 import feedparser
 
 import config
-import storage
+import metrics
 from agents.base_agent import BaseAgent
+from keywords import KeywordMatcher
+
+# Whole words only, so "acl" no longer matches inside "oracle"
+CONFERENCE_MATCHER = KeywordMatcher(config.CONFERENCE_KEYWORDS, boundary="word")
 
 
 class PapersAgent(BaseAgent):
     """Collects AI research papers from arXiv, HuggingFace, PapersWithCode, etc."""
 
+    count_label = "fetched"
+    item_noun = "papers"
+
     def get_agent_name(self) -> str:
         return "papers"
 
-    def collect(self) -> int:
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] PapersAgent: starting collection...")
-        total_new = 0
-        for name, url in config.PAPER_FEEDS.items():
-            papers = self._fetch_feed(name, url)
-            if papers:
-                added = self.add_items(papers)
-                total_new += added
-                print(f"  {name}: {len(papers)} fetched, {added} new")
-            else:
-                print(f"  {name}: 0 fetched")
-            time.sleep(1)
-
-        storage.cleanup_old_files("papers")
-        print(f"PapersAgent: {total_new} new papers added.")
-        return total_new
+    def get_sources(self) -> list[dict]:
+        return [{"name": name, "url": url} for name, url in config.PAPER_FEEDS.items()]
+
+    def parse_source(self, source: dict, body: bytes) -> list[dict]:
+        return self._fetch_feed(source["name"], body)
 
     @staticmethod
     def _parse_published(entry) -> datetime | None:
@@ -45,11 +40,8 @@ class PapersAgent(BaseAgent):
 
     @staticmethod
     def _detect_conference(text: str) -> str | None:
-        text_lower = text.lower()
-        for kw in config.CONFERENCE_KEYWORDS:
-            if kw in text_lower:
-                return kw.upper()
-        return None
+        kw = CONFERENCE_MATCHER.search(text)
+        return kw.upper() if kw else None
 
     @staticmethod
     def _clean_summary(raw: str) -> str:
@@ -60,11 +52,11 @@ class PapersAgent(BaseAgent):
             text = text[:497] + "..."
         return text
 
-    def _fetch_feed(self, name: str, url: str) -> list[dict]:
+    def _fetch_feed(self, name: str, body: bytes) -> list[dict]:
         try:
-            feed = feedparser.parse(url)
+            feed = feedparser.parse(body)
         except Exception as e:
-            print(f"  Error fetching {name}: {e}")
+            print(f"  Error parsing {name}: {e}")
             return []
 
         # 72h window so Monday runs catch Friday/weekend papers
@@ -74,7 +66,7 @@ class PapersAgent(BaseAgent):
         for entry in feed.entries:
             title = entry.get("title", "").strip()
             link = entry.get("link", "").strip()
-            if not title or not link:
+            if not title or not link or self.seen_before(link):
                 continue
 
             # Get the best available summary
@@ -88,6 +80,7 @@ class PapersAgent(BaseAgent):
 
             # arXiv feeds often have no parsed date — accept those entries
             if published and published < cutoff:
+                metrics.count("old")
                 continue
 
             conference_tag = self._detect_conference(title + " " + summary)
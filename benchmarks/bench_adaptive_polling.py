@@ -0,0 +1,91 @@
+"""Simulate fixed vs adaptive polling of every configured source for a couple of months.
+
+Each source publishes on a Poisson process with a per-agent mean gap; the
+daemon polls it either every base interval or on the adaptive schedule of
+sourcestats.next_interval. Reports fetches, mean detection delay and how many
+items reach a later daily digest than they would have with instant detection.
+
+Run from the repo root: python -m benchmarks.bench_adaptive_polling
+"""
+import bisect
+import random
+
+import config
+from agents.funding_agent import FundingAgent
+from agents.github_agent import GitHubAgent
+from agents.grants_agent import GrantsAgent
+from agents.news_agent import NewsAgent
+from agents.papers_agent import PapersAgent
+from sourcestats import base_interval, next_interval
+
+DAY = 86400.0
+DIGEST_HOUR = 8
+
+# Mean seconds between new items per source, by agent
+MEAN_GAP = {
+    "news": 4 * 3600,
+    "papers": DAY / 20,
+    "grants": 20 * DAY,
+    "funding": 10 * DAY,
+    "github": DAY / 5,
+}
+
+
+def _next_digest(t: float) -> float:
+    digest = (t // DAY) * DAY + DIGEST_HOUR * 3600
+    return digest if digest >= t else digest + DAY
+
+
+def _simulate(events: list[float], base: float, adaptive: bool, horizon: float) -> tuple[int, list[float], int]:
+    fetches, delays, late = 0, [], 0
+    t, last, interval = 0.0, 0.0, base
+    while t < horizon:
+        fetches += 1
+        lo, hi = bisect.bisect_right(events, last), bisect.bisect_right(events, t)
+        for e in events[lo:hi]:
+            delays.append(t - e)
+            late += _next_digest(t) > _next_digest(e)
+        if adaptive:
+            interval = next_interval(interval, base, hi > lo)
+        last = t
+        t += interval
+    return fetches, delays, late
+
+
+def run(days: int = 60, seed: int = 3) -> dict[str, float]:
+    rng = random.Random(seed)
+    horizon = days * DAY
+    results = {}
+    for mode in ("fixed", "adaptive"):
+        results[f"{mode}.fetches"] = results[f"{mode}.items"] = results[f"{mode}.late"] = 0
+        results[f"{mode}.delay_sum_s"] = 0.0
+    for agent in (NewsAgent(), PapersAgent(), GrantsAgent(), FundingAgent(), GitHubAgent()):
+        name = agent.get_agent_name()
+        for source in agent.get_sources():
+            events, t = [], 0.0
+            while (t := t + rng.expovariate(1 / MEAN_GAP[name])) < horizon:
+                events.append(t)
+            base = base_interval(name, source)
+            for mode in ("fixed", "adaptive"):
+                fetches, delays, late = _simulate(events, base, mode == "adaptive", horizon)
+                results[f"{mode}.fetches"] += fetches
+                results[f"{mode}.items"] += len(delays)
+                results[f"{mode}.delay_sum_s"] += sum(delays)
+                results[f"{mode}.late"] += late
+    return results
+
+
+def main():
+    results = run()
+    print(f"policy: x{config.POLL_BACKOFF} per poll, bounds {config.POLL_MIN_FACTOR}-{config.POLL_MAX_FACTOR} x base")
+    for mode in ("fixed", "adaptive"):
+        items = results[f"{mode}.items"] or 1
+        print(
+            f"{mode:9s} fetches {results[f'{mode}.fetches']:7d}   "
+            f"mean delay {results[f'{mode}.delay_sum_s'] / items / 3600:6.2f} h   "
+            f"items in a later digest {results[f'{mode}.late']:5d} of {results[f'{mode}.items']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
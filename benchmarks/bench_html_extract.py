@@ -0,0 +1,67 @@
+"""Parse time and peak memory of the portal scrapers: BeautifulSoup vs htmlextract.
+
+Each variant runs in a fresh interpreter so ru_maxrss reflects only that parser.
+Run from the repo root: python -m benchmarks.bench_html_extract
+"""
+import json
+import random
+import subprocess
+import sys
+
+WORDS = "seed fund scheme grant startup incubation program apply now ministry policy portal notice tender".split()
+
+
+def synthetic_portal_page(n_links: int = 20000, seed: int = 3) -> bytes:
+    """A heavy government-portal-like page: deep layout tables, menus and many links."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n_links):
+        text = " ".join(rng.choices(WORDS, k=rng.randint(2, 9)))
+        rows.append(
+            f'<tr><td class="c{i % 7}"><span>{i}.</span> <a href="/node/{i}" title="{text}">{text.title()}</a>'
+            f"<!-- row {i} --> <small>Published {rng.randint(1, 28)}/0{rng.randint(1, 9)}/2026</small></td></tr>"
+        )
+    return (
+        '<html><head><meta charset="utf-8"><script>var menu = [];</script><style>td{}</style></head><body>'
+        '<div id="wrap"><table>' + "".join(rows) + "</table></div></body></html>"
+    ).encode("utf-8")
+
+
+_CHILD = r"""
+import json, resource, sys, time
+sys.path.insert(0, ".")
+from benchmarks.bench_html_extract import synthetic_portal_page
+body = synthetic_portal_page(int(sys.argv[2]))
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+if sys.argv[1] == "bs4":
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(body, "lxml")
+    out = [(a.get_text(strip=True), a["href"], a.parent.get_text(strip=True)[:250]) for a in soup.find_all("a", href=True)]
+else:
+    from htmlextract import iter_anchors
+    out = [(a.text, a.href, a.parent_text(limit=250)) for a in iter_anchors(body)]
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "peak_rss_kib_delta": peak - base, "anchors": len(out)}))
+"""
+
+
+def run(n_links: int = 20000) -> dict[str, dict]:
+    results = {}
+    for variant in ("bs4", "lxml"):
+        out = subprocess.run(
+            [sys.executable, "-c", _CHILD, variant, str(n_links)], capture_output=True, text=True, check=True
+        )
+        results[variant] = json.loads(out.stdout)
+    return results
+
+
+def main():
+    results = run()
+    for variant, r in results.items():
+        print(f"{variant:5s} {r['seconds'] * 1000:8.1f} ms  +{r['peak_rss_kib_delta'] / 1024:7.1f} MiB peak RSS  ({r['anchors']} anchors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Measure CLI startup imports per command, in fresh interpreters.
+
+Each scenario runs the imports its command performs (main.py, the registry
+lookups, then the command's own modules) in a new process and reports the
+import wall time and which heavy third-party packages got loaded. "eager
+registry" reproduces the old agents/__init__.py, which imported every agent.
+
+Run from the repo root: python -m benchmarks.bench_import_time
+"""
+import json
+import subprocess
+import sys
+
+HEAVY = ["aiohttp", "bs4", "feedparser", "lxml", "numpy"]
+
+SCENARIOS = {
+    "--help": "import main",
+    "--send": "import main; import emailer, formatter, subscriptions",
+    "--collect-agent github": "import main; main.ALL_AGENTS['github']; import collector",
+    "--collect": "import main; [main.COLLECTIBLE_AGENTS[n] for n in main.COLLECTIBLE_AGENTS]; import collector",
+    "eager registry": "import main; import agents.news_agent, agents.papers_agent, agents.grants_agent, "
+                      "agents.funding_agent, agents.github_agent",
+}
+
+_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - t
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _measure(code: str, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(code=code, heavy=HEAVY)],
+            capture_output=True, text=True, check=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {"seconds": min(r["seconds"] for r in runs), "heavy": runs[0]["heavy"]}
+
+
+def run(repeat: int = 5) -> dict[str, dict]:
+    return {name: _measure(code, repeat) for name, code in SCENARIOS.items()}
+
+
+def main():
+    for name, result in run().items():
+        print(f"{name:24s} {result['seconds'] * 1000:7.1f} ms   {', '.join(result['heavy']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compare the compiled keyword matchers with the per-keyword `any(w in text ...)` scans.
+
+Run from the repo root: python -m benchmarks.bench_keywords
+"""
+import random
+import timeit
+
+import config
+from agents import funding_agent, grants_agent
+from keywords import KeywordMatcher
+
+VOCAB = (
+    "startup india seed fund scheme grant support for women entrepreneurs apply now "
+    "incubation program deadline portal ministry department innovation challenge "
+    "technology research call for proposal msme credit guarantee policy state "
+    "guidelines notification tender circular annual report download form"
+).split()
+
+
+def _anchor_texts(n: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(VOCAB, k=rng.randint(3, 14))) for _ in range(n)]
+
+
+def _scan(words: list[str]):
+    return lambda text: any(w in text.lower() for w in words)
+
+
+def _time(fn, texts: list[str], repeat: int = 5) -> float:
+    return min(timeit.repeat(lambda: [fn(t) for t in texts], number=1, repeat=repeat))
+
+
+def run(n_anchors: int = 20000) -> dict[str, float]:
+    texts = _anchor_texts(n_anchors)
+    page = " ".join(texts)
+    conference = KeywordMatcher(config.CONFERENCE_KEYWORDS, boundary="word")
+    results = {}
+    for label, words, matcher in [
+        ("grants.noise", grants_agent.NOISE_WORDS, grants_agent.NOISE_MATCHER),
+        ("grants.strong", grants_agent.STRONG_INDICATORS, grants_agent.STRONG_MATCHER),
+        ("funding.noise", funding_agent.NOISE_WORDS, funding_agent.NOISE_MATCHER),
+        ("funding.strong", funding_agent.STRONG_INDICATORS, funding_agent.STRONG_MATCHER),
+    ]:
+        results[f"{label}.scan_s"] = _time(_scan(words), texts)
+        results[f"{label}.matcher_s"] = _time(matcher.matches, texts)
+
+    # Whole-page pass: every keyword hit in one go vs one scan per keyword
+    results["conference.page.scan_s"] = _time(
+        lambda text: [w for w in config.CONFERENCE_KEYWORDS if w in text.lower()], [page], repeat=3
+    )
+    results["conference.page.matcher_s"] = _time(conference.findall, [page], repeat=3)
+    return results
+
+
+def main():
+    results = run()
+    for key in sorted(k for k in results if k.endswith(".scan_s")):
+        label = key[: -len(".scan_s")]
+        scan, matcher = results[key], results[f"{label}.matcher_s"]
+        print(f"{label:24s} scan {scan * 1000:8.1f} ms   matcher {matcher * 1000:8.1f} ms   x{scan / matcher:5.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Regenerate the benchmark fixtures in benchmarks/fixtures/ (gzip-compressed).
+
+The pages mirror the markup the agents parse on the live sites (rss.arxiv.org
+RSS 2.0, a news blog feed, github.com/trending, a large government scheme
+portal) with deterministic filler text, so benchmark runs are reproducible
+and need no network. Feed entries carry no dates, so the agents' recency
+cutoffs keep every entry whenever the suite runs.
+
+Run from the repo root: python -m benchmarks.make_fixtures
+"""
+import gzip
+import html
+import os
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+WORDS = (
+    "we propose a novel framework for large language model reasoning with reinforcement learning "
+    "from human feedback and show that diffusion transformers scale to multimodal agents benchmark "
+    "results on vision language tasks demonstrate state of the art performance while reducing "
+    "inference cost retrieval augmented generation alignment safety evaluation dataset training "
+    "efficient sparse attention graph neural network robotics policy optimization theory bounds"
+).split()
+
+SCHEME_WORDS = (
+    "startup india seed fund scheme grant support for women entrepreneurs incubation program "
+    "credit guarantee msme innovation challenge call for proposal apply now technology "
+    "development fund subsidy state policy biotechnology ignition research fellowship"
+).split()
+
+NAV_WORDS = "home about us contact us sitemap faq login register media gallery tenders rti careers".split()
+
+
+def _sentence(rng: random.Random, words: list[str], lo: int, hi: int) -> str:
+    return " ".join(rng.choices(words, k=rng.randint(lo, hi)))
+
+
+def arxiv_feed(n: int = 400, seed: int = 1) -> bytes:
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        title = _sentence(rng, WORDS, 6, 14).capitalize()
+        abstract = ". ".join(_sentence(rng, WORDS, 12, 25).capitalize() for _ in range(rng.randint(5, 9)))
+        authors = ", ".join(f"Author{rng.randint(1, 9999)} Name{rng.randint(1, 9999)}" for _ in range(rng.randint(1, 8)))
+        if i % 9 == 0:
+            abstract += ". Accepted at NeurIPS 2026"
+        arxiv_id = f"2610.{10000 + i:05d}"
+        items.append(f"""<item>
+<title>{html.escape(title)}</title>
+<link>https://arxiv.org/abs/{arxiv_id}</link>
+<description>arXiv:{arxiv_id}v1 Announce Type: new
+Abstract: {html.escape(abstract)}.</description>
+<guid isPermaLink="false">oai:arXiv.org:{arxiv_id}v1</guid>
+<category>cs.LG</category>
+<dc:creator>{html.escape(authors)}</dc:creator>
+</item>""")
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss xmlns:dc="http://purl.org/dc/elements/1.1/" version="2.0"><channel>'
+        "<title>cs.LG updates on arXiv.org</title><link>http://rss.arxiv.org/rss/cs.LG</link>"
+        "<description>cs.LG updates on the arXiv.org e-print archive.</description>\n"
+        + "\n".join(items) + "\n</channel></rss>"
+    ).encode("utf-8")
+
+
+def news_feed(n: int = 60, seed: int = 2) -> bytes:
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        title = _sentence(rng, WORDS, 5, 11).capitalize()
+        body = "".join(f"<p>{_sentence(rng, WORDS, 20, 40)}.</p>" for _ in range(rng.randint(3, 10)))
+        items.append(f"""<item>
+<title>{html.escape(title)}</title>
+<link>https://blog.example.com/2026/10/{i}-{title.lower().replace(' ', '-')[:40]}</link>
+<description>{html.escape(body)}</description>
+<category>AI</category>
+</item>""")
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel><title>AI Blog</title>'
+        "<link>https://blog.example.com</link><description>News</description>\n"
+        + "\n".join(items) + "\n</channel></rss>"
+    ).encode("utf-8")
+
+
+_OCTICON = '<svg aria-hidden="true" height="16" viewBox="0 0 16 16" version="1.1" width="16" class="octicon"><path d="M8 .25a.75.75 0 0 1 .673.418l1.882 3.815 4.21.612a.75.75 0 0 1 .416 1.279l-3.046 2.97.719 4.192a.751.751 0 0 1-1.088.791L8 12.347l-3.766 1.98a.75.75 0 0 1-1.088-.79l.72-4.194L.818 6.374a.75.75 0 0 1 .416-1.28l4.21-.611L7.327.668A.75.75 0 0 1 8 .25Z"></path></svg>'
+
+
+def github_trending(n: int = 25, seed: int = 3) -> bytes:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        owner, repo = f"owner{rng.randint(1, 999)}", f"repo-{i}-{rng.choice(WORDS)}"
+        rows.append(f"""
+<article class="Box-row">
+  <div class="float-right d-flex">{_OCTICON * 3}<a class="btn-sm btn" href="/login?return_to=/{owner}/{repo}">Star</a></div>
+  <h2 class="h3 lh-condensed">
+    <a data-view-component="true" class="Link" href="/{owner}/{repo}">{_OCTICON}
+      <span class="text-normal">{owner} /</span>
+      {repo}</a>
+  </h2>
+  <p class="col-9 color-fg-muted my-1 pr-4">{html.escape(_sentence(rng, WORDS, 6, 20))}</p>
+  <div class="f6 color-fg-muted mt-2">
+    <span class="d-inline-block ml-0 mr-3"><span class="repo-language-color"></span>
+      <span itemprop="programmingLanguage">{rng.choice(["Python", "TypeScript", "Rust", "Go", "C++"])}</span></span>
+    <a class="Link--muted d-inline-block mr-3" href="/{owner}/{repo}/stargazers">{_OCTICON} {rng.randint(100, 90000):,}</a>
+    <a class="Link--muted d-inline-block mr-3" href="/{owner}/{repo}/forks">{_OCTICON} {rng.randint(10, 9000):,}</a>
+    <span class="d-inline-block mr-3">Built by {"".join(f'<a class="d-inline-block" href="/u{j}"><img class="avatar mb-1" src="https://avatars.githubusercontent.com/u/{j}?s=40&amp;v=4" width="20" height="20"></a>' for j in range(5))}</span>
+    <span class="d-inline-block float-sm-right">{_OCTICON} {rng.randint(10, 3000):,} stars today</span>
+  </div>
+</article>""")
+    nav = "".join(f'<li><a href="/{w}" class="HeaderMenu-link">{w.title()}</a></li>' for w in NAV_WORDS * 20)
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Trending repositories on GitHub today</title>'
+        + "<script>" + "window.__data = " + "[" + ",".join('{"k":%d}' % j for j in range(3000)) + "];</script>"
+        + '</head><body><header><ul>' + nav + '</ul></header><main><div class="Box">'
+        + "".join(rows) + "</div></main></body></html>"
+    ).encode("utf-8")
+
+
+def government_portal(n_links: int = 6000, seed: int = 4) -> bytes:
+    rng = random.Random(seed)
+    menus = "".join(
+        f'<li class="menu-item"><a href="/{w}">{w.title()}</a><ul>'
+        + "".join(f'<li><a href="/{w}/{j}">{_sentence(rng, NAV_WORDS, 1, 3).title()}</a></li>' for j in range(15))
+        + "</ul></li>"
+        for w in NAV_WORDS
+    )
+    rows = []
+    for i in range(n_links):
+        text = _sentence(rng, SCHEME_WORDS, 3, 12).title()
+        href = f"/schemes/{i}" if i % 3 else f"https://portal.example.gov.in/content/scheme-{i}.html"
+        status = rng.choice(["Open", "Open", "Closed", "Last date 15/03/2024", "Ongoing"])
+        rows.append(
+            f'<tr class="views-row"><td>{i + 1}</td><td><div class="field-content"><a href="{href}">{html.escape(text)}</a>'
+            f'<p>{_sentence(rng, SCHEME_WORDS, 10, 30)}. Status: {status}</p></div></td>'
+            f"<td><span class=\"date\">{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2026</span></td></tr>"
+        )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Schemes | Government of India</title>'
+        "<style>" + ".c{color:red}" * 2000 + "</style><script>var drupalSettings = {};</script></head><body>"
+        '<nav><ul class="menu">' + menus + '</ul></nav><div class="view-content"><table class="views-table">'
+        + "".join(rows) + "</table></div><footer>" + menus + "</footer></body></html>"
+    ).encode("utf-8")
+
+
+FIXTURES = {
+    "arxiv_cs_lg.rss.gz": arxiv_feed,
+    "news_blog.rss.gz": news_feed,
+    "github_trending.html.gz": github_trending,
+    "gov_portal.html.gz": government_portal,
+}
+
+
+def load_fixture(name: str) -> bytes:
+    with gzip.open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def main():
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for name, make in FIXTURES.items():
+        body = make()
+        path = os.path.join(FIXTURES_DIR, name)
+        # mtime=0 keeps the compressed files byte-identical across regenerations
+        with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+            f.write(body)
+        print(f"{name:26s} {len(body) / 1024:8.0f} KiB  ({os.path.getsize(path) / 1024:.0f} KiB compressed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Offline benchmark suite for the collection and digest hot paths.
+
+Times the agents' parsers on the recorded fixtures in benchmarks/fixtures/,
+storage.add_articles into 10k-item day files for every backend, and
+formatter.format_digest over a large day (cold and warm item cache). Every
+case runs against a throwaway DATA_DIR. Results are written as JSON with the
+commit they were measured at, and --compare prints the change against an
+earlier results file.
+
+Run from the repo root:
+    python -m benchmarks.suite [--output bench_results.json] [--compare OLD.json] [--quick]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import config
+from benchmarks.make_fixtures import SCHEME_WORDS, WORDS, load_fixture
+
+DAY = datetime(2026, 1, 5)
+
+
+def _sentence(rng: random.Random, words: list[str], lo: int, hi: int) -> str:
+    return " ".join(rng.choices(words, k=rng.randint(lo, hi)))
+
+
+def make_items(agent_name: str, n: int, seed: int = 0, prefix: str = "") -> list[dict]:
+    """Distinct synthetic items shaped like the given agent's stored items."""
+    rng = random.Random(f"{agent_name}-{seed}")
+    items = []
+    for i in range(n):
+        link = f"https://example.com/{agent_name}/{prefix}{i}"
+        if agent_name == "github":
+            items.append({
+                "name": f"owner{i}/repo{prefix}{i}", "link": link, "description": _sentence(rng, WORDS, 5, 20),
+                "language": "Python", "stars": rng.randint(0, 90000), "stars_today": rng.randint(0, 3000),
+                "source": "GitHub Trending Daily", "published": DAY.isoformat(),
+            })
+            continue
+        words = SCHEME_WORDS if agent_name in ("grants", "funding") else WORDS
+        item = {
+            "title": _sentence(rng, words, 5, 14).capitalize(),
+            "link": link,
+            "summary": _sentence(rng, words, 30, 80),
+            "source": rng.choice(list(config.NEWS_FEEDS)) if agent_name == "news" else f"{agent_name} source {i % 12}",
+            "published": DAY.isoformat(),
+        }
+        if agent_name == "papers":
+            item["conference_tag"] = rng.choice([None, None, None, "NEURIPS"])
+        elif agent_name == "grants":
+            item["region"] = "Central"
+        elif agent_name == "funding":
+            item["type"] = "seed"
+        items.append(item)
+    return items
+
+
+class _DataDir:
+    """Point config.DATA_DIR (and so storage, the seen index and item cache) at a fresh temp dir."""
+
+    def __enter__(self):
+        self._previous = config.DATA_DIR
+        config.DATA_DIR = tempfile.mkdtemp(prefix="bench-")
+        return config.DATA_DIR
+
+    def __exit__(self, *exc):
+        shutil.rmtree(config.DATA_DIR, ignore_errors=True)
+        config.DATA_DIR = self._previous
+
+
+def _measure(fn, setup=None, repeat: int = 5) -> list[float]:
+    """Run fn(setup()) `repeat` times, timing only fn."""
+    runs = []
+    for _ in range(repeat):
+        with _DataDir():
+            state = setup() if setup else None
+            # Don't bill earlier cases' garbage to this one
+            gc.collect()
+            start = time.perf_counter()
+            fn(state)
+            runs.append(time.perf_counter() - start)
+    return runs
+
+
+def _parser_cases() -> dict:
+    from agents.github_agent import GitHubAgent
+    from agents.grants_agent import GrantsAgent
+    from agents.news_agent import NewsAgent
+    from agents.papers_agent import PapersAgent
+
+    arxiv = load_fixture("arxiv_cs_lg.rss.gz")
+    blog = load_fixture("news_blog.rss.gz")
+    trending = load_fixture("github_trending.html.gz")
+    portal = load_fixture("gov_portal.html.gz")
+    portal_source = {"name": "Portal", "url": "https://portal.example.gov.in/schemes", "region": "Central"}
+    return {
+        "papers.fetch_feed": lambda _: PapersAgent()._fetch_feed("arXiv cs.LG", arxiv),
+        "news.fetch_feed": lambda _: NewsAgent()._fetch_feed("AI Blog", blog),
+        "grants.scrape_source": lambda _: GrantsAgent()._scrape_source(portal_source, portal),
+        "github.scrape_trending": lambda _: GitHubAgent()._scrape_trending(trending, "GitHub Trending Daily"),
+    }
+
+
+def _storage_cases(day_items: int, batch: int) -> dict:
+    import storage
+
+    existing = make_items("papers", day_items)
+    # Half new links, half already in the day file
+    incoming = make_items("papers", batch // 2, seed=1, prefix="new") + existing[: batch // 2]
+    cases = {}
+    for backend in storage.BACKENDS:
+        def setup(backend=backend):
+            config.STORAGE_BACKEND = backend
+            storage.save_articles("papers", existing, DAY)
+
+        def add(_):
+            storage.add_articles("papers", incoming, DAY)
+
+        cases[f"storage.add_articles.{backend}"] = (add, setup)
+    return cases
+
+
+def _digest_cases(sizes: dict[str, int]) -> dict:
+    import formatter
+    import storage
+
+    day = {agent: make_items(agent, n) for agent, n in sizes.items()}
+
+    def setup_cold():
+        config.STORAGE_BACKEND = "json"
+        for agent, items in day.items():
+            storage.save_articles(agent, items, DAY)
+
+    def setup_warm():
+        setup_cold()
+        formatter.format_digest(DAY)
+
+    def build(_):
+        formatter.format_digest(DAY)
+
+    return {"formatter.format_digest.cold": (build, setup_cold), "formatter.format_digest.warm": (build, setup_warm)}
+
+
+def _git_commit() -> tuple[str, bool]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "", False
+
+
+def run(repeat: int = 5, quick: bool = False) -> dict:
+    backend = config.STORAGE_BACKEND
+    cases: dict = {name: (fn, None) for name, fn in _parser_cases().items()}
+    cases.update(_storage_cases(day_items=2000 if quick else 12000, batch=500))
+    sizes = {"news": 3000, "papers": 5000, "grants": 500, "funding": 500, "github": 50}
+    if quick:
+        sizes = {agent: max(10, n // 10) for agent, n in sizes.items()}
+    cases.update(_digest_cases(sizes))
+
+    results = {}
+    try:
+        for name, (fn, setup) in cases.items():
+            runs = _measure(fn, setup, repeat)
+            results[name] = {"min_s": min(runs), "median_s": statistics.median(runs), "runs": len(runs)}
+            print(f"{name:34s} min {min(runs) * 1000:9.2f} ms   median {statistics.median(runs) * 1000:9.2f} ms")
+    finally:
+        config.STORAGE_BACKEND = backend
+
+    commit, dirty = _git_commit()
+    return {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "quick": quick,
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict):
+    print(f"\nvs {baseline.get('commit', '?')[:10]} (median, ratio < 1 is faster)")
+    for name, result in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if old:
+            print(f"{name:34s} {old['median_s'] * 1000:9.2f} -> {result['median_s'] * 1000:9.2f} ms   x{result['median_s'] / old['median_s']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite")
+    parser.add_argument("--output", default="bench_results.json", help="Results file (JSON)")
+    parser.add_argument("--compare", metavar="FILE", help="Earlier results file to compare against")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="Smaller data sets, for a fast sanity run")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.quick)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nWrote {os.path.abspath(args.output)}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import zip_longest
+
+import config
+import storage
+from fetcher import AsyncFetcher
+from health import SourceHealth
+from metrics import RunMetrics
+from sourcestats import SourceStats
+
+# Marks the end of a pipeline queue
+_DONE = None
+
+# Agent instances reused by each parse worker process
+_worker_agents: dict = {}
+
+
+def interleave(jobs: list[tuple]) -> list[tuple]:
+    """Reorder (agent, source) jobs round-robin across agents so neighbouring
+    jobs usually target different hosts."""
+    per_agent: dict = {}
+    for agent, source in jobs:
+        per_agent.setdefault(agent, []).append((agent, source))
+    return [job for batch in zip_longest(*per_agent.values()) for job in batch if job is not None]
+
+
+def _parse_in_worker(agent_cls, source: dict, body: bytes) -> tuple[list[dict], dict]:
+    """Parse one body inside a worker process (module-level so it pickles)."""
+    agent = _worker_agents.get(agent_cls)
+    if agent is None:
+        agent = _worker_agents[agent_cls] = agent_cls()
+    return agent.parse_with_metrics(source, body)
+
+
+def make_parse_pool(parse_workers: int) -> Executor:
+    if parse_workers > 0:
+        # Forked workers would inherit the event loop, open sockets and held locks
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        return ProcessPoolExecutor(max_workers=parse_workers, mp_context=context)
+    return ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+
+
+class ParsePool:
+    """The parse stage's executor from make_parse_pool. A process pool is
+    unusable once a worker dies (killed, out of memory, crashed in a C
+    extension), so a broken pool is replaced by a fresh one."""
+
+    def __init__(self, parse_workers: int):
+        self.parse_workers = parse_workers
+        self.executor = make_parse_pool(parse_workers)
+
+    async def parse(self, agent, source: dict, body: bytes) -> tuple[list[dict], dict]:
+        loop = asyncio.get_running_loop()
+        if isinstance(self.executor, ProcessPoolExecutor):
+            return await loop.run_in_executor(self.executor, _parse_in_worker, type(agent), source, body)
+        return await loop.run_in_executor(self.executor, agent.parse_with_metrics, source, body)
+
+    def rebuild(self, broken: Executor):
+        # Every parse in flight fails with the same broken pool; only the first replaces it
+        if self.executor is not broken:
+            return
+        print("  Parse pool broken (a worker process died), starting a new one")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.executor = make_parse_pool(self.parse_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.executor.shutdown()
+
+
+def parser_count(parse_workers: int) -> int:
+    """Parse-stage tasks to run for a pool made by make_parse_pool(parse_workers)."""
+    return parse_workers or os.cpu_count() or 1
+
+
+def all_jobs(agents) -> list[tuple]:
+    """Every source of the given agents as interleaved (agent, source) jobs."""
+    return interleave([(agent, source) for agent in agents for source in agent.get_sources()])
+
+
+def due_jobs(jobs: list[tuple], stats: SourceStats | None) -> list[tuple]:
+    """The jobs whose adaptive poll interval has elapsed (all of them without stats)."""
+    if stats is None:
+        return jobs
+    return [(agent, source) for agent, source in jobs if stats.is_due(agent.get_agent_name(), source)]
+
+
+def _open_circuits(jobs: list[tuple], health: SourceHealth | None) -> set[tuple[str, str]]:
+    """(agent name, source name) of the jobs the circuit breaker skips this run."""
+    if health is None:
+        return set()
+    return {
+        (agent.get_agent_name(), source["name"])
+        for agent, source in jobs if not health.allow(agent.get_agent_name(), source)
+    }
+
+
+async def _fetch_stage(
+    jobs, fetcher: AsyncFetcher, fetched: asyncio.Queue, stats: SourceStats | None, run_metrics: RunMetrics | None,
+    health: SourceHealth | None,
+):
+    async def fetch_one(agent, source):
+        m = run_metrics.source(agent.get_agent_name(), source["name"]) if run_metrics is not None else None
+        try:
+            result = await agent.fetch_source(fetcher, source)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            print(f"  Error fetching {source['name']}: {error}")
+            if stats is not None:
+                stats.record_failure(agent.get_agent_name(), source)
+            if health is not None:
+                health.record_failure(agent.get_agent_name(), source, error)
+            if m is not None:
+                m.status = getattr(e, "status", 0)
+                m.error = f"fetch: {type(e).__name__}"
+            return
+        if health is not None:
+            health.record_success(agent.get_agent_name(), source, result.elapsed)
+        if m is not None:
+            m.status = result.status
+            m.fetch_seconds = round(result.elapsed, 4)
+            m.bytes = len(result.body)
+        if result.not_modified:
+            print(f"  {source['name']}: not modified")
+            if stats is not None:
+                stats.record_unchanged(agent.get_agent_name(), source)
+            return
+        await fetched.put((agent, source, result))
+
+    skipped = _open_circuits(jobs, health)
+    for agent_name, source_name in sorted(skipped):
+        print(f"  Skipping {source_name}: circuit open (see --health)")
+        if run_metrics is not None:
+            run_metrics.source(agent_name, source_name).error = "circuit open"
+    await asyncio.gather(*(
+        fetch_one(agent, source) for agent, source in jobs
+        if (agent.get_agent_name(), source["name"]) not in skipped
+    ))
+
+
+async def _parse_stage(
+    fetched: asyncio.Queue, parsed: asyncio.Queue, pool: ParsePool, stats: SourceStats | None, run_metrics: RunMetrics | None
+):
+    while (job := await fetched.get()) is not _DONE:
+        agent, source, result = job
+        m = run_metrics.source(agent.get_agent_name(), source["name"]) if run_metrics is not None else None
+        executor = pool.executor
+        try:
+            items, parse_info = await pool.parse(agent, source, result.body)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                pool.rebuild(executor)
+            print(f"  Error parsing {source['name']}: {e}")
+            if stats is not None:
+                stats.record_failure(agent.get_agent_name(), source)
+            if m is not None:
+                m.error = f"parse: {type(e).__name__}"
+            continue
+        if m is not None:
+            m.parse_seconds = round(parse_info["parse_seconds"], 4)
+            m.skipped = parse_info["skipped"]
+            m.found = len(items)
+        await parsed.put((agent, source, result, items))
+
+
+async def _write_stage(
+    parsed: asyncio.Queue, fetcher: AsyncFetcher, totals: dict[str, int], stats: SourceStats | None,
+    run_metrics: RunMetrics | None,
+):
+    """Single writer: drains whatever has been parsed and stores it with one
+    storage write per agent, then confirms the stored responses' validators
+    and records each source's poll."""
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        done = False
+        while not done:
+            batch = [await parsed.get()]
+            while not parsed.empty():
+                batch.append(parsed.get_nowait())
+            if batch[-1] is _DONE:
+                batch.pop()
+                done = True
+
+            by_agent: dict = {}
+            for agent, source, result, items in batch:
+                by_agent.setdefault(agent, []).append((source, result, items))
+            for agent, entries in by_agent.items():
+                start = time.perf_counter()
+                try:
+                    added = await loop.run_in_executor(
+                        writer, agent.store_batch, [(source, items) for source, _, items in entries]
+                    )
+                except Exception as e:
+                    print(f"  Error storing {', '.join(source['name'] for source, _, _ in entries)}: {e}")
+                    for source, _, _ in entries:
+                        if stats is not None:
+                            stats.record_failure(agent.get_agent_name(), source)
+                        if run_metrics is not None:
+                            run_metrics.source(agent.get_agent_name(), source["name"]).error = f"store: {type(e).__name__}"
+                    continue
+                totals[agent.get_agent_name()] += added
+                if run_metrics is not None:
+                    m = run_metrics.agent(agent.get_agent_name())
+                    m.write_seconds = round(m.write_seconds + time.perf_counter() - start, 4)
+                    m.writes += 1
+                    m.found += sum(len(items) for _, _, items in entries)
+                    m.new += added
+                for source, result, items in entries:
+                    fetcher.remember(source["url"], result, agent.get_agent_name())
+                    if stats is not None:
+                        stats.record_items(agent.get_agent_name(), source, items)
+
+
+async def run_pipeline(
+    jobs: list[tuple], fetcher: AsyncFetcher, pool: ParsePool, n_parsers: int,
+    stats: SourceStats | None = None, run_metrics: RunMetrics | None = None, health: SourceHealth | None = None,
+) -> dict[str, int]:
+    """Push (agent, source) jobs through fetch -> parse -> write on an already
+    open fetcher and parse pool, recording each poll's outcome in `stats`,
+    its measurements in `run_metrics` and its fetch health in `health` when
+    given. Sources whose circuit `health` holds open are skipped. Returns
+    new-item counts keyed by agent name."""
+    totals = {agent.get_agent_name(): 0 for agent, _ in jobs}
+    fetched: asyncio.Queue = asyncio.Queue(maxsize=config.PIPELINE_QUEUE_SIZE)
+    parsed: asyncio.Queue = asyncio.Queue()
+
+    parsers = [asyncio.create_task(_parse_stage(fetched, parsed, pool, stats, run_metrics)) for _ in range(n_parsers)]
+    writer = asyncio.create_task(_write_stage(parsed, fetcher, totals, stats, run_metrics))
+
+    await _fetch_stage(jobs, fetcher, fetched, stats, run_metrics, health)
+    for _ in parsers:
+        await fetched.put(_DONE)
+    await asyncio.gather(*parsers)
+    await parsed.put(_DONE)
+    await writer
+    return totals
+
+
+async def run_agents_async(agents, workers: int | None = None, parse_workers: int | None = None) -> dict[str, int]:
+    """Collect every source of the given agents as a three-stage pipeline.
+
+    Fetch: every source is requested through one AsyncFetcher (bounded by
+    `workers`) and its body put on a bounded queue. Parse: bodies are parsed
+    on `parse_workers` processes (threads when 0), so CPU-heavy pages use
+    every core while downloads continue. Write: a single writer batches the
+    parsed items into storage, so each day file only ever has one writer.
+    Returns new-item counts keyed by agent name.
+    """
+    if parse_workers is None:
+        parse_workers = config.PARSE_WORKERS
+    for agent in agents:
+        agent.log_start()
+
+    stats = SourceStats() if config.ADAPTIVE_POLLING else None
+    jobs = all_jobs(agents)
+    due = due_jobs(jobs, stats)
+    if len(due) < len(jobs):
+        print(f"  Skipping {len(jobs) - len(due)} sources not due yet (adaptive polling)")
+
+    run_metrics = RunMetrics() if config.METRICS else None
+    health = SourceHealth() if config.SOURCE_HEALTH else None
+    totals = {agent.get_agent_name(): 0 for agent in agents}
+    with ParsePool(parse_workers) as pool:
+        async with AsyncFetcher(workers) as fetcher:
+            totals.update(await run_pipeline(
+                due, fetcher, pool, parser_count(parse_workers), stats, run_metrics, health
+            ))
+        print(f"  {fetcher.stats.summary()}")
+    if stats is not None:
+        stats.save()
+    if health is not None:
+        health.save()
+    if run_metrics is not None:
+        run_metrics.finish(fetcher.stats)
+        run_metrics.write()
+
+    for agent in agents:
+        storage.cleanup_old_files(agent.get_agent_name())
+        agent.log_done(totals[agent.get_agent_name()])
+    return totals
+
+
+def run_agents(agents, workers: int | None = None, parse_workers: int | None = None) -> int:
+    """Synchronous entry point for run_agents_async. Returns the total count of new items."""
+    return sum(asyncio.run(run_agents_async(agents, workers, parse_workers)).values())
@@ -104,6 +104,22 @@ PAPER_KEYWORDS = AI_KEYWORDS + [
     "agentic", "chain of thought", "reasoning",
 ]
 
+# ---------------------------------------------------------------------------
+# Near-duplicate detection (digest collapses the same story from several sources)
+# ---------------------------------------------------------------------------
+DEDUP_NEAR_DUPLICATES = True
+SHINGLE_SIZE = 2
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32
+# Estimated Jaccard similarity of title+summary shingles above which items merge
+NEAR_DUP_THRESHOLD = 0.5
+# Badges shown for the other sources of a collapsed item; the rest become "+N more"
+MAX_SOURCE_BADGES = 5
+
+# Cache per-item digest work (signatures) by content hash in data/item_cache.sqlite3
+ITEM_CACHE = os.getenv("ITEM_CACHE", "1") != "0"
+ITEM_CACHE_MAX_ENTRIES = 50000
+
 # ---------------------------------------------------------------------------
 # Email Configuration
 # ---------------------------------------------------------------------------
@@ -111,8 +127,21 @@ GMAIL_ADDRESS = os.getenv("GMAIL_ADDRESS", "")
 GMAIL_APP_PASSWORD = os.getenv("GMAIL_APP_PASSWORD", "")
 RECIPIENT_EMAIL = os.getenv("RECIPIENT_EMAIL", "")
 
-SMTP_SERVER = "smtp.gmail.com"
-SMTP_PORT = 587
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+# Turn both off to send through a local relay or test server (e.g. aiosmtpd)
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") != "0"
+SMTP_LOGIN = os.getenv("SMTP_LOGIN", "1") != "0"
+SMTP_TIMEOUT = 30
+# Retries of a message after a transient failure (reconnecting if the session dropped);
+# every message gets at least one attempt
+SMTP_RETRIES = 2
+
+# Per-person digests: a JSON list of {"email", "sections", "keywords"} entries.
+# Without the file the whole digest goes to RECIPIENT_EMAIL.
+SUBSCRIPTIONS_FILE = os.getenv(
+    "SUBSCRIPTIONS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "subscriptions.json")
+)
 
 # ---------------------------------------------------------------------------
 # News tier mapping (tier 1 sources sort first in digest)
@@ -123,8 +152,152 @@ NEWS_TIER1 = {
     "Microsoft AI Blog", "The Verge AI",
 }
 
+# ---------------------------------------------------------------------------
+# Digest ranking (BM25 of title + summary against keyword sets)
+# ---------------------------------------------------------------------------
+RANKING = os.getenv("RANKING", "1") != "0"
+# Keyword set per section; sections without one keep their stored order
+RANK_KEYWORDS = {
+    "news": AI_KEYWORDS,
+    "papers": PAPER_KEYWORDS,
+}
+# Most items shown per section after ranking
+SECTION_LIMITS = {
+    "news": 30,
+    "papers": 40,
+    "grants": 20,
+    "funding": 20,
+    "github": 25,
+}
+# Score multiplier per source (default 1.0)
+SOURCE_WEIGHTS = {name: 1.5 for name in NEWS_TIER1}
+TITLE_WEIGHT = 2.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+
 # ---------------------------------------------------------------------------
 # Storage
 # ---------------------------------------------------------------------------
-DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+# Everything stored: items, indexes, archive, metrics (also --data-dir)
+DATA_DIR = os.getenv("DATA_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
 STORAGE_RETENTION_DAYS = 7
+# Skip links an agent already collected on an earlier day (kept for STORAGE_RETENTION_DAYS)
+CROSS_DAY_DEDUP = os.getenv("CROSS_DAY_DEDUP", "1") != "0"
+# Item store: "json" (one file per agent per day), "jsonl" (append-only day logs)
+# or "sqlite" (data/items.sqlite3)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json")
+# Move expired days into compressed monthly archives (data/archive/<agent>/YYYY-MM.jsonl.gz)
+# instead of deleting them
+ARCHIVE = os.getenv("ARCHIVE", "1") != "0"
+# Days an archived item is kept (0 = forever); whole months are dropped at once
+ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "0"))
+ARCHIVE_COMPRESSLEVEL = 9
+# Full-text index of every collected item for --search (data/search.sqlite3)
+SEARCH_INDEX = os.getenv("SEARCH_INDEX", "1") != "0"
+# Hits shown by --search
+SEARCH_LIMIT = 20
+
+# ---------------------------------------------------------------------------
+# Collection
+# ---------------------------------------------------------------------------
+# Sources fetched in parallel across all agents (1 = one at a time)
+COLLECT_WORKERS = int(os.getenv("COLLECT_WORKERS", "8"))
+# Processes parsing downloaded pages/feeds (0 = parse on threads in-process)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+# Downloaded bodies allowed to wait for a parser before fetching pauses
+PIPELINE_QUEUE_SIZE = 32
+# Minimum seconds between two requests to the same host
+HOST_MIN_INTERVAL = float(os.getenv("HOST_MIN_INTERVAL", "2"))
+
+# ---------------------------------------------------------------------------
+# Polling schedule (--daemon, and adaptive skipping in one-shot runs)
+# ---------------------------------------------------------------------------
+# Base seconds between polls of each agent's sources; a source dict may set its own "interval"
+POLL_INTERVALS = {
+    "news": 3600,
+    "papers": 6 * 3600,
+    "grants": 24 * 3600,
+    "funding": 24 * 3600,
+    "github": 12 * 3600,
+}
+DEFAULT_POLL_INTERVAL = 6 * 3600
+# Adapt each source's interval to how often it changes (stats in data/source_stats.json)
+ADAPTIVE_POLLING = os.getenv("ADAPTIVE_POLLING", "1") != "0"
+# Interval multiplier per unchanged poll (divisor per changed poll)
+POLL_BACKOFF = 1.5
+# Adaptive interval bounds, as multiples of the base interval
+POLL_MIN_FACTOR = 0.5
+POLL_MAX_FACTOR = 4
+# A source counts as due this fraction of its interval early (absorbs cron jitter)
+POLL_DUE_SLACK = 0.1
+# Weight of the latest poll in the new-items-per-poll moving average
+POLL_RATE_ALPHA = 0.3
+# Local time (HH:MM) the daemon sends the digest
+DIGEST_TIME = os.getenv("DIGEST_TIME", "08:00")
+# Longest the scheduler sleeps before re-checking its clock (seconds)
+DAEMON_TICK = 60
+
+# ---------------------------------------------------------------------------
+# Source health (data/source_health.json, shown by --health)
+# ---------------------------------------------------------------------------
+# Record per-source fetch outcomes, latencies and failure streaks
+SOURCE_HEALTH = os.getenv("SOURCE_HEALTH", "1") != "0"
+# Skip sources whose circuit is open (needs SOURCE_HEALTH)
+CIRCUIT_BREAKER = os.getenv("CIRCUIT_BREAKER", "1") != "0"
+# Consecutive failed fetches that open a source's circuit
+CIRCUIT_FAILURE_THRESHOLD = 3
+# Seconds an open circuit skips the source before one probe fetch is let through;
+# doubled after every failed probe, up to CIRCUIT_MAX_COOLDOWN
+CIRCUIT_COOLDOWN = 3600
+CIRCUIT_MAX_COOLDOWN = 24 * 3600
+# Recent fetch latencies kept per source for the percentiles
+HEALTH_LATENCY_WINDOW = 50
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+# Write metrics.prom (Prometheus text format) and run_summary.json after each run
+METRICS = os.getenv("METRICS", "1") != "0"
+# Directory for the metrics files (default: data/metrics)
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+
+# ---------------------------------------------------------------------------
+# Local server (--serve)
+# ---------------------------------------------------------------------------
+SERVE_HOST = os.getenv("SERVE_HOST", "127.0.0.1")
+SERVE_PORT = int(os.getenv("SERVE_PORT", "8080"))
+# Rendered responses kept in memory (least recently used dropped first)
+SERVE_CACHE_ENTRIES = 64
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 15
+# Connection pool: total open connections and per-host keep-alive connections
+HTTP_POOL_SIZE = 100
+HTTP_POOL_PER_HOST = 4
+HTTP_KEEPALIVE = 30
+# Retries on 429/5xx with jittered exponential backoff (seconds)
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF_BASE = 1.0
+HTTP_BACKOFF_MAX = 30.0
+# Most seconds one source's fetch may take, retries and backoff included (0 = no limit);
+# a source dict may set its own "budget"
+SOURCE_FETCH_BUDGET = float(os.getenv("SOURCE_FETCH_BUDGET", "40"))
+# Send If-None-Match / If-Modified-Since and skip parsing on 304 Not Modified
+HTTP_CONDITIONAL_GET = os.getenv("HTTP_CONDITIONAL_GET", "1") != "0"
+# Record every response (status, headers, body) into this directory (--record)
+HTTP_RECORD_DIR = os.getenv("HTTP_RECORD_DIR", "")
+# Serve responses from a recording instead of the network (--replay)
+HTTP_REPLAY_DIR = os.getenv("HTTP_REPLAY_DIR", "")
+# Synthetic per-host latency / errors applied during replay (--faults), a JSON
+# object keyed by host ("*" = every host; "arxiv.org" also matches subdomains):
+#   {"*": {"latency": 0.05}, "arxiv.org": {"latency": 0.8, "jitter": 0.4,
+#    "error_rate": 0.2, "error_status": 503, "timeout_rate": 0.05}}
+REPLAY_FAULTS_FILE = os.getenv("REPLAY_FAULTS_FILE", "")
+# Seed for the fault injection, so replays are repeatable
+REPLAY_SEED = int(os.getenv("REPLAY_SEED", "0"))
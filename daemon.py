@@ -0,0 +1,150 @@
+import asyncio
+import signal
+import time
+from datetime import datetime, timedelta
+
+import collector
+import config
+import storage
+from fetcher import AsyncFetcher
+from health import SourceHealth
+from metrics import RunMetrics
+from sourcestats import SourceStats, base_interval
+
+
+def _next_digest_time(now: datetime) -> datetime:
+    """The next local DIGEST_TIME strictly after `now`."""
+    hour, minute = (int(part) for part in config.DIGEST_TIME.split(":"))
+    at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return at if at > now else at + timedelta(days=1)
+
+
+def _timestamp() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class Scheduler:
+    """In-process scheduler behind `--daemon`.
+
+    Every source is polled on its own interval: POLL_INTERVALS per agent
+    (or the source's "interval" key), adapted by SourceStats to how often
+    the source actually changes. Due sources go through the same
+    fetch -> parse -> write pipeline as `--collect`, but the HTTP session,
+    parse processes and every in-process cache stay warm between rounds.
+    `send_digest`, if given, is called once a day at DIGEST_TIME and
+    reports its own outcome. SIGTERM or SIGINT lets the current round
+    finish, then closes the session and pool and saves state before run()
+    returns.
+    """
+
+    def __init__(self, agents, send_digest=None, workers: int | None = None, parse_workers: int | None = None):
+        self.send_digest = send_digest
+        self.workers = workers
+        self.parse_workers = config.PARSE_WORKERS if parse_workers is None else parse_workers
+        self.agents = agents
+        self.jobs = [(agent, source) for agent in agents for source in agent.get_sources()]
+        self.stats = SourceStats() if config.ADAPTIVE_POLLING else None
+        self.health = SourceHealth() if config.SOURCE_HEALTH else None
+        # Resume where the stats left off; never-polled sources are due now
+        self.next_due = {}
+        for agent, source in self.jobs:
+            last_poll = self.stats.get(agent.get_agent_name(), source).get("last_poll") if self.stats else None
+            self.next_due[self._key(agent, source)] = last_poll + self.interval(agent, source) if last_poll else 0.0
+        self._stop: asyncio.Event | None = None
+        self._cleanup_day = None
+
+    @staticmethod
+    def _key(agent, source: dict) -> tuple[str, str]:
+        return agent.get_agent_name(), source["name"]
+
+    def interval(self, agent, source: dict) -> float:
+        """Seconds between two polls of a source."""
+        if self.stats is not None:
+            return self.stats.interval(agent.get_agent_name(), source)
+        return base_interval(agent.get_agent_name(), source)
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+
+    def _due_jobs(self, now: float) -> list[tuple]:
+        return [(agent, source) for agent, source in self.jobs if self.next_due[self._key(agent, source)] <= now]
+
+    def _cleanup(self):
+        """Expire old stored items once per calendar day."""
+        today = datetime.now().date()
+        if self._cleanup_day == today:
+            return
+        for agent in self.agents:
+            storage.cleanup_old_files(agent.get_agent_name())
+        self._cleanup_day = today
+
+    async def _poll(self, due: list[tuple], fetcher: AsyncFetcher, pool: collector.ParsePool):
+        started = time.time()
+        print(f"[{_timestamp()}] Polling {len(due)} due sources...")
+        run_metrics = RunMetrics(fetcher.stats) if config.METRICS else None
+        totals = await collector.run_pipeline(
+            collector.interleave(due), fetcher, pool, collector.parser_count(self.parse_workers),
+            self.stats, run_metrics, self.health,
+        )
+        if run_metrics is not None:
+            run_metrics.finish(fetcher.stats)
+            run_metrics.write()
+        # Intervals reflect this round's outcome
+        for agent, source in due:
+            self.next_due[self._key(agent, source)] = started + self.interval(agent, source)
+        fetcher.save_validators()
+        if self.stats is not None:
+            self.stats.save()
+        if self.health is not None:
+            self.health.save()
+        self._cleanup()
+        counts = ", ".join(f"{name} {count}" for name, count in totals.items())
+        print(f"[{_timestamp()}] Round done in {time.time() - started:.1f}s: {counts} new")
+
+    async def _send_digest(self):
+        print(f"[{_timestamp()}] Sending digest...")
+        loop = asyncio.get_running_loop()
+        # send_digest reports its own outcome
+        try:
+            await loop.run_in_executor(None, self.send_digest)
+        except Exception as e:
+            print(f"Failed to send digest: {e}")
+
+    async def _sleep(self, seconds: float):
+        """Sleep up to `seconds`, waking early on shutdown."""
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=max(0.0, seconds))
+        except asyncio.TimeoutError:
+            pass
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # No signal handlers here (Windows, or not the main thread)
+
+        next_digest = _next_digest_time(datetime.now()) if self.send_digest else None
+        print(f"[{_timestamp()}] Daemon started: {len(self.jobs)} sources"
+              + (f", digest at {next_digest:%Y-%m-%d %H:%M}" if next_digest else ""))
+
+        with collector.ParsePool(self.parse_workers) as pool:
+            async with AsyncFetcher(self.workers) as fetcher:
+                while not self._stop.is_set():
+                    due = self._due_jobs(time.time())
+                    if due:
+                        await self._poll(due, fetcher, pool)
+
+                    if next_digest is not None and datetime.now() >= next_digest and not self._stop.is_set():
+                        await self._send_digest()
+                        next_digest = _next_digest_time(datetime.now())
+
+                    wake = min(self.next_due.values()) - time.time() if self.next_due else config.DAEMON_TICK
+                    if next_digest is not None:
+                        wake = min(wake, (next_digest - datetime.now()).total_seconds())
+                    await self._sleep(min(wake, config.DAEMON_TICK))
+            print(f"  {fetcher.stats.summary()}")
+        print(f"[{_timestamp()}] Daemon stopped.")
@@ -0,0 +1,153 @@
+import re
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import numpy as np
+
+import config
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src", "cmpid"}
+
+ARXIV_ID = re.compile(r"(\d{4}\.\d{4,5})(v\d+)?")
+ARXIV_HOSTS = {"arxiv.org", "export.arxiv.org", "huggingface.co", "alphaxiv.org"}
+
+# Universal hashing (a*x + b) mod p over 32-bit shingle hashes; p is the first prime above 2**32
+_PRIME = np.uint64(4294967311)
+_rng = np.random.default_rng(20240901)
+_A = _rng.integers(1, 2 ** 31, size=config.MINHASH_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, 2 ** 31, size=config.MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL so the same story or paper linked from different feeds compares equal.
+
+    arXiv abstract/PDF links and Hugging Face paper pages collapse to "arxiv:<id>".
+    Otherwise the scheme, "www.", fragment, trailing slash and tracking
+    parameters are dropped and the remaining query is sorted.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    if host in ARXIV_HOSTS:
+        match = ARXIV_ID.search(parts.path)
+        if match and (host != "huggingface.co" or parts.path.startswith("/papers/")):
+            return f"arxiv:{match.group(1)}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return f"{host}{path}?{urlencode(query)}" if query else f"{host}{path}"
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    words = re.findall(r"[a-z0-9]+", re.sub(r"<[^>]+>", " ", text).lower())
+    k = config.SHINGLE_SIZE
+    if len(words) >= k:
+        shingles = {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+    else:
+        shingles = set(words)
+    return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def minhash_signature(text: str) -> np.ndarray | None:
+    """MinHash signature of the text's word shingles, or None if it has no words."""
+    hashes = _shingle_hashes(text)
+    if not hashes.size:
+        return None
+    return ((np.outer(hashes, _A) + _B) % _PRIME).min(axis=0)
+
+
+def _item_text(item: dict) -> str:
+    title = item.get("title", item.get("name", ""))
+    summary = item.get("summary", item.get("description", ""))
+    return f"{title} {summary}"
+
+
+def item_signature(item: dict) -> np.ndarray | None:
+    """MinHash signature of an item's title and summary."""
+    return minhash_signature(_item_text(item))
+
+
+def signature_params() -> str:
+    """Settings a cached signature depends on."""
+    return f"{config.SHINGLE_SIZE}/{config.MINHASH_PERMUTATIONS}"
+
+
+def cluster_near_duplicates(items: list[dict], signatures: list[np.ndarray | None] | None = None) -> list[list[int]]:
+    """Group item indices that share a canonical URL or have near-identical text.
+
+    Candidates come from LSH banding of MinHash signatures, so the cost grows
+    with the number of items rather than the number of pairs; each candidate
+    pair is confirmed by its estimated Jaccard similarity.
+    Clusters and their members keep the input order. Precomputed
+    item_signature() results can be passed in `signatures`.
+    """
+    parent = list(range(len(items)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    by_url: dict[str, int] = {}
+    for i, item in enumerate(items):
+        key = canonical_url(item.get("link", ""))
+        if key in by_url:
+            union(by_url[key], i)
+        else:
+            by_url[key] = i
+
+    if signatures is None:
+        signatures = [item_signature(item) for item in items]
+    rows = config.MINHASH_PERMUTATIONS // config.LSH_BANDS
+    buckets: dict[tuple[int, bytes], list[int]] = {}
+    for i, sig in enumerate(signatures):
+        if sig is None:
+            continue
+        for band in range(config.LSH_BANDS):
+            key = (band, sig[band * rows:(band + 1) * rows].tobytes())
+            buckets.setdefault(key, []).append(i)
+
+    # Every pair sharing a bucket is a candidate; pairs met again in other bands are skipped
+    checked: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        for n, i in enumerate(members):
+            for j in members[n + 1:]:
+                if (i, j) in checked or find(i) == find(j):
+                    continue
+                checked.add((i, j))
+                similarity = np.count_nonzero(signatures[i] == signatures[j]) / config.MINHASH_PERMUTATIONS
+                if similarity >= config.NEAR_DUP_THRESHOLD:
+                    union(i, j)
+
+    clusters: dict[int, list[int]] = {}
+    for i in range(len(items)):
+        clusters.setdefault(find(i), []).append(i)
+    return list(clusters.values())
+
+
+def collapse_near_duplicates(items: list[dict], signatures: list[np.ndarray | None] | None = None) -> list[dict]:
+    """Merge each cluster of near-duplicates into its first item.
+
+    The kept item gets a "sources" list naming every source the story came
+    from, first source first. Items without duplicates are returned as-is.
+    """
+    merged = []
+    for cluster in cluster_near_duplicates(items, signatures):
+        item = items[cluster[0]]
+        if len(cluster) > 1:
+            sources = []
+            for i in cluster:
+                source = items[i].get("source", "")
+                if source and source not in sources:
+                    sources.append(source)
+            item = dict(item, sources=sources)
+        merged.append(item)
+    return merged
@@ -1,29 +1,127 @@
 import smtplib
+import time
+from email.charset import QP, Charset
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
 import config
 
 
-def send_email(subject: str, html_body: str) -> bool:
-    """Send an HTML email via Gmail SMTP. Returns True on success."""
-    if not config.GMAIL_ADDRESS or not config.GMAIL_APP_PASSWORD or not config.RECIPIENT_EMAIL:
-        print("Error: Email credentials not configured. Check your .env file.")
-        return False
+def _html_part(html_body: str) -> MIMEText:
+    # Quoted-printable wraps long lines, so no line of the message exceeds SMTP's limit
+    charset = Charset("utf-8")
+    charset.body_encoding = QP
+    return MIMEText(html_body, "html", charset)
+
 
+def _build_message(recipient: str, subject: str, html_body: str) -> MIMEMultipart:
     msg = MIMEMultipart("alternative")
     msg["Subject"] = subject
     msg["From"] = config.GMAIL_ADDRESS
-    msg["To"] = config.RECIPIENT_EMAIL
-    msg.attach(MIMEText(html_body, "html"))
+    msg["To"] = recipient
+    msg.attach(_html_part(html_body))
+    return msg
 
-    try:
-        with smtplib.SMTP(config.SMTP_SERVER, config.SMTP_PORT) as server:
+
+def _permanent(error: Exception) -> bool:
+    """5xx replies are permanent for this message; anything else may be transient."""
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    return False
+
+
+class SmtpSession:
+    """One SMTP connection (STARTTLS and login per config) reused for every
+    message of a run. A message whose send fails transiently is retried up to
+    SMTP_RETRIES times, reconnecting first if the server dropped the session.
+    Use as a context manager so the connection is closed with QUIT.
+    """
+
+    def __init__(self):
+        self._server: smtplib.SMTP | None = None
+
+    def _connect(self):
+        server = smtplib.SMTP(config.SMTP_SERVER, config.SMTP_PORT, timeout=config.SMTP_TIMEOUT)
+        if config.SMTP_STARTTLS:
             server.starttls()
+        if config.SMTP_LOGIN:
             server.login(config.GMAIL_ADDRESS, config.GMAIL_APP_PASSWORD)
-            server.sendmail(config.GMAIL_ADDRESS, config.RECIPIENT_EMAIL, msg.as_string())
-        print(f"Digest email sent to {config.RECIPIENT_EMAIL}")
-        return True
+        self._server = server
+
+    def _disconnect(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except smtplib.SMTPException:
+            self._server.close()
+        except OSError:
+            pass
+        self._server = None
+
+    def __enter__(self):
+        self._connect()
+        return self
+
+    def __exit__(self, *exc):
+        self._disconnect()
+
+    def send(self, recipient: str, subject: str, html_body: str):
+        """Send one HTML message, raising the last error once retries are exhausted."""
+        msg = _build_message(recipient, subject, html_body).as_string()
+        attempts = 1 + max(0, config.SMTP_RETRIES)
+        for attempt in range(attempts):
+            try:
+                if self._server is None:
+                    self._connect()
+                self._server.sendmail(config.GMAIL_ADDRESS, recipient, msg)
+                return
+            except OSError as e:
+                # smtplib's errors are OSErrors too; only retry transient failures
+                if _permanent(e) or attempt == attempts - 1:
+                    raise
+                # Start the next attempt on a fresh connection
+                self._disconnect()
+                time.sleep(2 ** attempt)
+
+
+def _credentials_ok() -> bool:
+    if not config.GMAIL_ADDRESS or (config.SMTP_LOGIN and not config.GMAIL_APP_PASSWORD):
+        print("Error: Email credentials not configured. Check your .env file.")
+        return False
+    return True
+
+
+def send_messages(messages) -> int:
+    """Send (recipient, subject, html_body) messages over one SMTP session.
+
+    `messages` may be a generator, so each body is only built when it is
+    about to be sent. Returns the number of messages sent; failures are
+    reported per recipient and don't stop the rest.
+    """
+    if not _credentials_ok():
+        return 0
+    sent = 0
+    try:
+        with SmtpSession() as session:
+            for recipient, subject, html_body in messages:
+                try:
+                    session.send(recipient, subject, html_body)
+                except Exception as e:
+                    print(f"Failed to send email to {recipient}: {e}")
+                    continue
+                print(f"Digest email sent to {recipient}")
+                sent += 1
     except Exception as e:
         print(f"Failed to send email: {e}")
+    return sent
+
+
+def send_email(subject: str, html_body: str) -> bool:
+    """Send an HTML email to RECIPIENT_EMAIL. Returns True on success."""
+    if not config.RECIPIENT_EMAIL:
+        print("Error: Email credentials not configured. Check your .env file.")
         return False
+    return send_messages([(config.RECIPIENT_EMAIL, subject, html_body)]) == 1
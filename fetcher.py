@@ -0,0 +1,232 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from http import HTTPStatus
+
+import aiohttp
+
+import config
+from httpcache import ValidatorStore
+from ratelimit import HostRateLimiter
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int
+    body: bytes
+    # Response headers with lower-cased names
+    headers: dict[str, str] = field(default_factory=dict)
+    # Seconds from sending the (last) request to having the whole body
+    elapsed: float = 0.0
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+@dataclass
+class FetchStats:
+    requests: int = 0
+    retries: int = 0
+    not_modified: int = 0
+    bytes_downloaded: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    # Fetches abandoned for overrunning their source's budget
+    over_budget: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"HTTP: {self.requests} requests, {self.retries} retries, {self.not_modified} not modified, "
+            f"{self.bytes_downloaded / 1024:.0f} KiB, {self.connections_created} new connections, "
+            f"{self.connections_reused} reused"
+            + (f", {self.over_budget} over budget" if self.over_budget else "")
+        )
+
+
+def _retry_delay(attempt: int, retry_after: str | None) -> float:
+    """Seconds to wait before retry number `attempt` (0-based).
+
+    Honours a numeric Retry-After header, otherwise uses exponential backoff
+    with full jitter so retries against the same host don't line up.
+    """
+    if retry_after and retry_after.strip().isdigit():
+        return min(float(retry_after), config.HTTP_BACKOFF_MAX)
+    return random.uniform(0, min(config.HTTP_BACKOFF_BASE * 2 ** attempt, config.HTTP_BACKOFF_MAX))
+
+
+class HTTPStatusError(Exception):
+    """A response with status >= 400 (after any retries)."""
+
+    def __init__(self, url: str, status: int):
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ""
+        super().__init__(f"{status} {reason}, url='{url}'".replace("  ", " "))
+        self.url = url
+        self.status = status
+
+
+class AiohttpTransport:
+    """Live HTTP: one pooled keep-alive aiohttp session with per-host
+    connection limits (so the GitHub daily and weekly pages share a TLS
+    connection) and separate connect/read timeouts."""
+
+    def __init__(self):
+        self._session: aiohttp.ClientSession | None = None
+
+    @staticmethod
+    def _trace_config(stats: FetchStats) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_create(session, ctx, params):
+            stats.connections_created += 1
+
+        async def on_reuse(session, ctx, params):
+            stats.connections_reused += 1
+
+        trace.on_connection_create_end.append(on_create)
+        trace.on_connection_reuseconn.append(on_reuse)
+        return trace
+
+    async def open(self, stats: FetchStats):
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=config.CONNECT_TIMEOUT,
+            sock_read=config.READ_TIMEOUT,
+        )
+        connector = aiohttp.TCPConnector(
+            limit=config.HTTP_POOL_SIZE,
+            limit_per_host=config.HTTP_POOL_PER_HOST,
+            keepalive_timeout=config.HTTP_KEEPALIVE,
+            ttl_dns_cache=300,
+        )
+        self._session = aiohttp.ClientSession(
+            headers=config.HTTP_HEADERS,
+            timeout=timeout,
+            connector=connector,
+            trace_configs=[self._trace_config(stats)],
+        )
+
+    async def close(self):
+        await self._session.close()
+        self._session = None
+
+    async def get(self, url: str, headers: dict[str, str] | None = None) -> FetchResult:
+        start = time.perf_counter()
+        async with self._session.get(url, headers=headers) as resp:
+            body = await resp.read()
+            resp_headers = {k.lower(): v for k, v in resp.headers.items()}
+            return FetchResult(str(resp.url), resp.status, body, resp_headers, time.perf_counter() - start)
+
+
+def _default_transport():
+    if config.HTTP_RECORD_DIR or config.HTTP_REPLAY_DIR:
+        import replay
+
+        return replay.transport_from_config()
+    return AiohttpTransport()
+
+
+class AsyncFetcher:
+    """Shared asyncio HTTP client for all agents.
+
+    Bounds the number of requests in flight, spaces out requests per host
+    and retries 429/5xx responses with jittered backoff. Requests go through
+    a transport: live HTTP by default, or recording/replaying responses when
+    HTTP_RECORD_DIR / HTTP_REPLAY_DIR is set (see replay.py). Requests are
+    made conditional with the validators remembered in `validators`;
+    callers confirm a response with `remember()` once its items are stored.
+    Use as an async context manager so the transport is closed and the
+    validators saved when the run ends.
+    """
+
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        limiter: HostRateLimiter | None = None,
+        validators: ValidatorStore | None = None,
+        transport=None,
+    ):
+        if concurrency is None:
+            concurrency = config.COLLECT_WORKERS
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.limiter = limiter or HostRateLimiter()
+        self.transport = transport or _default_transport()
+        # Recordings need full bodies and replays never answer 304
+        recording = config.HTTP_RECORD_DIR or config.HTTP_REPLAY_DIR
+        if validators is None and config.HTTP_CONDITIONAL_GET and not recording:
+            validators = ValidatorStore()
+        self.validators = validators
+        self.stats = FetchStats()
+
+    async def __aenter__(self):
+        await self.transport.open(self.stats)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.transport.close()
+        self.save_validators()
+
+    def save_validators(self):
+        """Persist the remembered validators (long-running callers save after each round)."""
+        if self.validators is not None:
+            self.validators.save()
+
+    async def fetch(self, url: str, budget: float | None = None, agent_name: str = "") -> FetchResult:
+        """GET a URL and return its body, conditionally if `agent_name` has stored it before.
+
+        Returns an empty-bodied result with status 304 when the server reports
+        the page unchanged. Raises on connection errors, HTTPStatusError on
+        HTTP >= 400 once retries are exhausted, and asyncio.TimeoutError when
+        the fetch overruns `budget` seconds (default SOURCE_FETCH_BUDGET),
+        counted from the first request and including retries.
+        """
+        headers = None
+        if self.validators is not None:
+            headers = self.validators.request_headers(ValidatorStore.key(agent_name, url))
+        budget = config.SOURCE_FETCH_BUDGET if budget is None else budget
+        loop = asyncio.get_running_loop()
+        deadline = None
+        attempt = 0
+        while True:
+            await self.limiter.wait_async(url)
+            async with self.semaphore:
+                if deadline is None and budget > 0:
+                    deadline = loop.time() + budget
+                self.stats.requests += 1
+                try:
+                    result = await asyncio.wait_for(
+                        self.transport.get(url, headers), deadline - loop.time() if deadline is not None else None
+                    )
+                except asyncio.TimeoutError:
+                    if deadline is None or loop.time() < deadline:
+                        raise
+                    self.stats.over_budget += 1
+                    raise asyncio.TimeoutError(f"over the {budget:g}s fetch budget") from None
+            self.stats.bytes_downloaded += len(result.body)
+            retry = result.status in RETRY_STATUSES and attempt < config.HTTP_RETRIES
+            if retry:
+                delay = _retry_delay(attempt, result.headers.get("retry-after"))
+                # A retry that can't finish within the budget isn't worth the wait
+                retry = deadline is None or loop.time() + delay < deadline
+            if not retry:
+                if result.status >= 400:
+                    raise HTTPStatusError(url, result.status)
+                if result.not_modified:
+                    self.stats.not_modified += 1
+                return result
+            # Back off outside the semaphore so other sources keep flowing
+            self.stats.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def remember(self, url: str, result: FetchResult, agent_name: str = ""):
+        """Record the validators of a response whose items `agent_name` has stored."""
+        if self.validators is not None and not result.not_modified:
+            self.validators.update(ValidatorStore.key(agent_name, url), result.headers)
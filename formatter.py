@@ -1,8 +1,15 @@
 import html
 import re
+from collections.abc import Iterator
 from datetime import datetime
+from typing import TextIO
+
+import numpy as np
 
 import config
+import dedup
+import item_cache
+import ranking
 import storage
 
 # Section definitions: (agent_name, display_title, color)
@@ -26,26 +33,36 @@ def _render_article(article: dict) -> str:
     summary = _strip_html_tags(article.get("summary", article.get("description", "")))
     summary = html.escape(summary)
 
-    badges = f'<span style="display:inline-block;margin-top:6px;padding:2px 8px;background:#f0f0f5;border-radius:10px;font-size:11px;color:#666;font-weight:500;">{source}</span>'
+    badges = [f'<span style="display:inline-block;margin-top:6px;padding:2px 8px;background:#f0f0f5;border-radius:10px;font-size:11px;color:#666;font-weight:500;">{source}</span>']
+
+    # Other sources of a collapsed near-duplicate
+    others = article.get("sources", [])[1:]
+    for other in others[:config.MAX_SOURCE_BADGES]:
+        badges.append(f'<span style="display:inline-block;margin-top:6px;padding:2px 8px;background:#f0f0f5;border-radius:10px;font-size:11px;color:#666;font-weight:500;">{html.escape(other)}</span>')
+    if len(others) > config.MAX_SOURCE_BADGES:
+        badges.append(f'<span style="display:inline-block;margin-top:6px;padding:2px 8px;background:#f0f0f5;border-radius:10px;font-size:11px;color:#999;font-weight:500;">+{len(others) - config.MAX_SOURCE_BADGES} more</span>')
 
     # Conference tag for papers
     conf = article.get("conference_tag")
     if conf:
-        badges += f' <span style="display:inline-block;margin-top:6px;padding:2px 8px;background:#fff3e0;border-radius:10px;font-size:11px;color:#e65100;font-weight:500;">{html.escape(conf)}</span>'
+        badges.append(f'<span style="display:inline-block;margin-top:6px;padding:2px 8px;background:#fff3e0;border-radius:10px;font-size:11px;color:#e65100;font-weight:500;">{html.escape(conf)}</span>')
 
     # Region badge for grants
     region = article.get("region")
     if region:
-        badges += f' <span style="display:inline-block;margin-top:6px;padding:2px 8px;background:#e8f5e9;border-radius:10px;font-size:11px;color:#2e7d32;font-weight:500;">{html.escape(region)}</span>'
+        badges.append(f'<span style="display:inline-block;margin-top:6px;padding:2px 8px;background:#e8f5e9;border-radius:10px;font-size:11px;color:#2e7d32;font-weight:500;">{html.escape(region)}</span>')
 
     # Type badge for funding
     ftype = article.get("type")
     if ftype:
-        badges += f' <span style="display:inline-block;margin-top:6px;padding:2px 8px;background:#fce4ec;border-radius:10px;font-size:11px;color:#c62828;font-weight:500;">{html.escape(ftype)}</span>'
+        badges.append(f'<span style="display:inline-block;margin-top:6px;padding:2px 8px;background:#fce4ec;border-radius:10px;font-size:11px;color:#c62828;font-weight:500;">{html.escape(ftype)}</span>')
 
     # Tier 1 badge for news
     if article.get("source") in config.NEWS_TIER1:
-        badges += ' <span style="display:inline-block;margin-top:6px;padding:2px 8px;background:#e3f2fd;border-radius:10px;font-size:11px;color:#1565c0;font-weight:500;">Tier 1</span>'
+        badges.append('<span style="display:inline-block;margin-top:6px;padding:2px 8px;background:#e3f2fd;border-radius:10px;font-size:11px;color:#1565c0;font-weight:500;">Tier 1</span>')
+
+    # One badge per line keeps every line of the message short (SMTP caps lines at 998 bytes)
+    badges = "\n                ".join(badges)
 
     summary_html = ""
     if summary:
@@ -88,16 +105,23 @@ def _render_github_repo(repo: dict) -> str:
             </div>"""
 
 
-def _render_section(title: str, color: str, items_html: str, count: int) -> str:
+def _render_section_open(title: str, color: str, count: int) -> str:
     return f"""
         <div style="margin-bottom:28px;padding-left:16px;border-left:4px solid {color};">
             <h2 style="margin:0 0 14px 0;font-size:17px;font-weight:700;color:{color};text-transform:uppercase;letter-spacing:0.5px;">{html.escape(title)}
                 <span style="font-size:12px;font-weight:400;color:#999;margin-left:8px;">({count})</span>
             </h2>
-{items_html}
+"""
+
+
+_SECTION_CLOSE = """
         </div>"""
 
 
+def _render_section(title: str, color: str, items_html: str, count: int) -> str:
+    return _render_section_open(title, color, count) + items_html + _SECTION_CLOSE
+
+
 def _sort_news_tier1_first(items: list[dict]) -> list[dict]:
     """Sort news articles so Tier 1 sources appear before Tier 2."""
     tier1 = [a for a in items if a.get("source") in config.NEWS_TIER1]
@@ -105,19 +129,34 @@ def _sort_news_tier1_first(items: list[dict]) -> list[dict]:
     return tier1 + tier2
 
 
-def format_digest(date: datetime | None = None) -> tuple[str, str]:
-    """Format all agent data into a unified HTML email digest. Returns (subject, html_body)."""
-    if date is None:
-        date = datetime.now()
+def _item_signatures(items: list[dict]) -> list[np.ndarray | None]:
+    """Near-duplicate signatures, reused from the item cache for items seen in an earlier build."""
+    params = dedup.signature_params()
+    keys = [item_cache.item_key("minhash", item, params) for item in items]
+    cache = item_cache.get_cache()
+    cached = cache.get_many(keys)
+    computed = {}
+    signatures = []
+    for key, item in zip(keys, items):
+        raw = cached.get(key)
+        if raw is None:
+            sig = dedup.item_signature(item)
+            raw = computed[key] = b"" if sig is None else sig.tobytes()
+        signatures.append(np.frombuffer(raw, dtype=np.uint64) if raw else None)
+    cache.put_many(computed)
+    return signatures
+
 
-    date_str = date.strftime("%B %d, %Y")
-    subject = f"Your Daily Briefing - {date_str}"
+def _digest_subject(date: datetime) -> str:
+    return f"Your Daily Briefing - {date.strftime('%B %d, %Y')}"
 
-    sections_html = ""
-    total_items = 0
 
+def _load_sections(date: datetime) -> list[tuple[str, str, str, list[dict]]]:
+    """Load and order each non-empty section's items: (agent_name, title, color, items)."""
+    sections = []
     for agent_name, title, color in SECTIONS:
-        items = storage.load_articles(agent_name, date)
+        # Past days may have been moved to the archive
+        items = storage.load_range(agent_name, date, date)
         if not items:
             continue
 
@@ -125,17 +164,21 @@ def format_digest(date: datetime | None = None) -> tuple[str, str]:
         if agent_name == "news":
             items = _sort_news_tier1_first(items)
 
-        total_items += len(items)
+        # Collapse the same story/paper reported by several sources
+        if config.DEDUP_NEAR_DUPLICATES and agent_name != "github":
+            signatures = _item_signatures(items) if config.ITEM_CACHE else None
+            items = dedup.collapse_near_duplicates(items, signatures)
+
+        # Most relevant first; capped at the section limit per recipient, after their filters
+        if config.RANKING:
+            items = ranking.order_section(agent_name, items)
 
-        if agent_name == "github":
-            items_html = "\n".join(_render_github_repo(r) for r in items)
-        else:
-            items_html = "\n".join(_render_article(a) for a in items)
+        sections.append((agent_name, title, color, items))
+    return sections
 
-        sections_html += _render_section(title, color, items_html, len(items))
 
-    if not sections_html:
-        html_body = f"""<html><body style="font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;margin:0;padding:0;background:#f4f4f8;">
+def _render_empty(date_str: str) -> str:
+    return f"""<html><body style="font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;margin:0;padding:0;background:#f4f4f8;">
         <div style="max-width:640px;margin:0 auto;padding:20px;">
             <div style="background:#1a1a2e;border-radius:10px 10px 0 0;padding:28px 30px;">
                 <h1 style="margin:0;color:#ffffff;font-size:22px;font-weight:700;">Your Daily Briefing</h1>
@@ -146,9 +189,10 @@ def format_digest(date: datetime | None = None) -> tuple[str, str]:
             </div>
         </div>
         </body></html>"""
-        return subject, html_body
 
-    html_body = f"""<html>
+
+def _render_header(date_str: str, total_items: int) -> str:
+    return f"""<html>
 <body style="font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;margin:0;padding:0;background:#f4f4f8;">
     <div style="max-width:640px;margin:0 auto;padding:20px;">
 
@@ -160,7 +204,10 @@ def format_digest(date: datetime | None = None) -> tuple[str, str]:
 
         <!-- Content -->
         <div style="background:#fafafe;padding:28px 26px;border-radius:0 0 10px 10px;">
-{sections_html}
+"""
+
+
+_FOOTER = """
             <!-- Footer -->
             <div style="border-top:1px solid #e8e8e8;margin-top:10px;padding-top:18px;text-align:center;">
                 <p style="font-size:11px;color:#aaa;margin:0;">Curated by Personal AI Assistant</p>
@@ -171,4 +218,96 @@ def format_digest(date: datetime | None = None) -> tuple[str, str]:
 </body>
 </html>"""
 
-    return subject, html_body
+
+class SharedDigest:
+    """One day's digest sections, loaded once, from which any number of
+    per-recipient digests are assembled.
+
+    A subscription (see subscriptions.Subscription) narrows the digest with
+    wants_section(agent_name) and wants_item(item); without one the full
+    digest is produced. With cache_fragments each item is rendered at most
+    once and kept for the next recipient; otherwise every item is rendered,
+    yielded and dropped.
+    """
+
+    def __init__(self, date: datetime | None = None, cache_fragments: bool = False):
+        self.date = date or datetime.now()
+        self.subject = _digest_subject(self.date)
+        self.sections = _load_sections(self.date)
+        self._fragments: dict[tuple[str, int], str] | None = {} if cache_fragments else None
+
+    def _fragment(self, agent_name: str, index: int, item: dict) -> str:
+        render = _render_github_repo if agent_name == "github" else _render_article
+        if self._fragments is None:
+            return render(item)
+        key = (agent_name, index)
+        fragment = self._fragments.get(key)
+        if fragment is None:
+            fragment = self._fragments[key] = render(item)
+        return fragment
+
+    def _select(self, subscription=None) -> list[tuple[str, str, str, list[tuple[int, dict]]]]:
+        selected = []
+        for agent_name, title, color, items in self.sections:
+            if subscription is not None and not subscription.wants_section(agent_name):
+                continue
+            chosen = [
+                (i, item) for i, item in enumerate(items)
+                if subscription is None or subscription.wants_item(item)
+            ]
+            if config.RANKING:
+                chosen = chosen[:config.SECTION_LIMITS.get(agent_name)]
+            if chosen:
+                selected.append((agent_name, title, color, chosen))
+        return selected
+
+    def item_count(self, subscription=None) -> int:
+        """How many items the subscription's digest would contain."""
+        return sum(len(items) for _, _, _, items in self._select(subscription))
+
+    def iter_body(self, subscription=None) -> Iterator[str]:
+        """Yield the HTML body in chunks, one item at a time."""
+        date_str = self.date.strftime("%B %d, %Y")
+        sections = self._select(subscription)
+        if not sections:
+            yield _render_empty(date_str)
+            return
+
+        yield _render_header(date_str, sum(len(items) for _, _, _, items in sections))
+        for agent_name, title, color, items in sections:
+            yield _render_section_open(title, color, len(items))
+            for n, (i, item) in enumerate(items):
+                if n:
+                    yield "\n"
+                yield self._fragment(agent_name, i, item)
+            yield _SECTION_CLOSE
+        yield _FOOTER
+
+    def body(self, subscription=None) -> str:
+        return "".join(self.iter_body(subscription))
+
+
+def iter_digest(date: datetime | None = None) -> Iterator[str]:
+    """Yield the digest's HTML body in chunks, one item at a time.
+
+    Concatenating the chunks gives exactly format_digest()'s html_body; the
+    full document is never built as one string here, and no rendered item
+    is kept once it has been yielded.
+    """
+    yield from SharedDigest(date).iter_body()
+
+
+def format_digest(date: datetime | None = None) -> tuple[str, str]:
+    """Format all agent data into a unified HTML email digest. Returns (subject, html_body)."""
+    if date is None:
+        date = datetime.now()
+    return _digest_subject(date), "".join(iter_digest(date))
+
+
+def format_digest_to(fileobj: TextIO, date: datetime | None = None) -> str:
+    """Stream the digest's HTML body into a text file object chunk by chunk. Returns the subject."""
+    if date is None:
+        date = datetime.now()
+    for chunk in iter_digest(date):
+        fileobj.write(chunk)
+    return _digest_subject(date)
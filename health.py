@@ -0,0 +1,176 @@
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+
+import config
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+def _health_path() -> str:
+    return os.path.join(config.DATA_DIR, "source_health.json")
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Nearest-rank q-th percentile (0-100) of values, None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+
+class SourceHealth:
+    """Persistent per-source fetch health and circuit breaker, keyed by
+    "agent/source name".
+
+    Each entry tracks fetch successes and failures, the current failure
+    streak, the last success and last error, and a window of recent fetch
+    latencies. CIRCUIT_FAILURE_THRESHOLD consecutive failures open the
+    source's circuit: it is skipped until its cooldown ends, then one probe
+    fetch is let through (half-open). A successful probe closes the circuit;
+    a failed one reopens it with twice the cooldown.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or _health_path()
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries: dict[str, dict] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self._entries = {}
+
+    @staticmethod
+    def key(agent_name: str, source: dict) -> str:
+        return f"{agent_name}/{source['name']}"
+
+    def get(self, agent_name: str, source: dict) -> dict:
+        return self._entries.get(self.key(agent_name, source), {})
+
+    def entries(self) -> dict[str, dict]:
+        return dict(self._entries)
+
+    def allow(self, agent_name: str, source: dict, now: float | None = None) -> bool:
+        """Whether the source should be fetched now. An open circuit whose
+        cooldown has ended turns half-open and lets this fetch through as its probe."""
+        if not config.CIRCUIT_BREAKER:
+            return True
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(self.key(agent_name, source))
+            if entry is None or entry["state"] == CLOSED:
+                return True
+            if entry["state"] == OPEN:
+                if now < entry["open_until"]:
+                    return False
+                entry["state"] = HALF_OPEN
+                self._dirty = True
+            return True
+
+    def _entry(self, agent_name: str, source: dict) -> dict:
+        return self._entries.setdefault(self.key(agent_name, source), {
+            "state": CLOSED, "successes": 0, "failures": 0, "consecutive_failures": 0,
+            "cooldown": 0, "latencies": [],
+        })
+
+    def record_success(self, agent_name: str, source: dict, seconds: float):
+        with self._lock:
+            entry = self._entry(agent_name, source)
+            entry["successes"] += 1
+            entry["consecutive_failures"] = 0
+            entry["last_success"] = time.time()
+            entry["latencies"] = (entry["latencies"] + [round(seconds, 3)])[-config.HEALTH_LATENCY_WINDOW:]
+            if entry["state"] != CLOSED:
+                print(f"  {source['name']}: recovered, circuit closed")
+            entry["state"] = CLOSED
+            entry["cooldown"] = 0
+            entry.pop("open_until", None)
+            self._dirty = True
+
+    def record_failure(self, agent_name: str, source: dict, error: str):
+        now = time.time()
+        with self._lock:
+            entry = self._entry(agent_name, source)
+            entry["failures"] += 1
+            entry["consecutive_failures"] += 1
+            entry["last_failure"] = now
+            entry["last_error"] = error
+            if entry["state"] == HALF_OPEN or entry["consecutive_failures"] >= config.CIRCUIT_FAILURE_THRESHOLD:
+                if entry["state"] == HALF_OPEN:
+                    cooldown = min(entry["cooldown"] * 2, config.CIRCUIT_MAX_COOLDOWN)
+                else:
+                    cooldown = entry["cooldown"] or config.CIRCUIT_COOLDOWN
+                if entry["state"] != OPEN and config.CIRCUIT_BREAKER:
+                    print(f"  {source['name']}: circuit open for {cooldown / 3600:g}h "
+                          f"after {entry['consecutive_failures']} failed fetches")
+                entry["state"] = OPEN
+                entry["cooldown"] = cooldown
+                entry["open_until"] = now + cooldown
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self._dirty = False
+
+
+def _ago(timestamp: float | None, now: float) -> str:
+    if not timestamp:
+        return "never"
+    seconds = now - timestamp
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m ago"
+    if seconds < 48 * 3600:
+        return f"{seconds / 3600:.0f}h ago"
+    return f"{seconds / 86400:.0f}d ago"
+
+
+def _seconds(value: float | None) -> str:
+    return "-" if value is None else f"{value:.2f}s"
+
+
+def format_report(health: SourceHealth, now: float | None = None) -> str:
+    """A table of every tracked source, unhealthy sources first."""
+    now = time.time() if now is None else now
+    entries = health.entries()
+    if not entries:
+        return "No source health recorded yet (run a collection first)."
+
+    def order(item):
+        key, entry = item
+        return ({OPEN: 0, HALF_OPEN: 1}.get(entry["state"], 2), -entry["consecutive_failures"], key)
+
+    rows = []
+    for key, entry in sorted(entries.items(), key=order):
+        state = entry["state"]
+        if state == OPEN:
+            state += f" until {datetime.fromtimestamp(entry['open_until']):%m-%d %H:%M}"
+        fetches = entry["successes"] + entry["failures"]
+        rows.append([
+            key,
+            state,
+            str(entry["consecutive_failures"]),
+            f"{entry['successes'] / fetches:.0%}" if fetches else "-",
+            _seconds(percentile(entry["latencies"], 50)),
+            _seconds(percentile(entry["latencies"], 95)),
+            _ago(entry.get("last_success"), now),
+            entry.get("last_error", "") if entry["consecutive_failures"] else "",
+        ])
+    header = ["source", "state", "fails", "ok", "p50", "p95", "last success", "last error"]
+    widths = [max(len(row[i]) for row in rows + [header]) for i in range(len(header) - 1)]
+    lines = []
+    for row in [header] + rows:
+        lines.append("  ".join(cell.ljust(width) for cell, width in zip(row, widths)) + "  " + row[-1])
+    return "\n".join(line.rstrip() for line in lines)
@@ -0,0 +1,102 @@
+import codecs
+import re
+from collections.abc import Iterator
+
+from lxml import etree
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_.:-]+)""", re.IGNORECASE)
+# Elements whose text BeautifulSoup's get_text() leaves out (script/stylesheet/template/ruby strings)
+_NON_TEXT_TAGS = {"script", "style", "template", "rt", "rp"}
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+]
+
+
+def sniff_encoding(body: bytes) -> str:
+    """Pick the encoding the way BeautifulSoup does for HTML bytes:
+    BOM, then the declared <meta> charset, then UTF-8 if it decodes, else Windows-1252."""
+    for bom, encoding in _BOMS:
+        if body.startswith(bom):
+            return encoding
+    match = _META_CHARSET.search(body[:4096])
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode("ascii")).name
+        except LookupError:
+            pass
+    try:
+        body.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "windows-1252"
+
+
+def get_text(el, limit: int | None = None) -> str:
+    """Text of an element like BeautifulSoup's get_text(strip=True): every text
+    node stripped, empty ones dropped, joined without a separator. Comments,
+    processing instructions and script/style/template/ruby-annotation contents
+    are skipped, though text following them still counts. With `limit`, stops walking once
+    that many characters are collected and returns exactly the first `limit`."""
+    parts = []
+    size = 0
+
+    def add(text: str | None) -> bool:
+        nonlocal size
+        if text:
+            text = text.strip()
+            if text:
+                parts.append(text)
+                size += len(text)
+        return limit is not None and size >= limit
+
+    if add(el.text):
+        return "".join(parts)[:limit]
+    stack = [(el, iter(el))]
+    while stack:
+        node, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            if stack and add(node.tail):
+                break
+            continue
+        if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+            if add(child.text):
+                break
+            stack.append((child, iter(child)))
+        elif add(child.tail):
+            break
+    text = "".join(parts)
+    return text if limit is None else text[:limit]
+
+
+class Anchor:
+    """One <a href> of a page. The parent's text is only computed when asked
+    for, since on portal pages one container often holds thousands of links."""
+
+    __slots__ = ("text", "href", "_el")
+
+    def __init__(self, el):
+        self._el = el
+        self.text = get_text(el)
+        self.href = el.get("href")
+
+    def parent_text(self, limit: int | None = None) -> str:
+        parent = self._el.getparent()
+        return get_text(parent, limit) if parent is not None else ""
+
+
+def iter_anchors(body: bytes) -> Iterator[Anchor]:
+    """Yield every <a> with an href attribute, in document order, parsed with lxml
+    directly instead of through a BeautifulSoup tree."""
+    if not body.strip():
+        return
+    parser = etree.HTMLParser(encoding=sniff_encoding(body))
+    root = etree.fromstring(body, parser)
+    if root is None:
+        return
+    for el in root.iter("a"):
+        if el.get("href") is not None:
+            yield Anchor(el)
@@ -0,0 +1,72 @@
+import json
+import os
+import threading
+
+import config
+
+
+def _validators_path() -> str:
+    return os.path.join(config.DATA_DIR, "http_validators.json")
+
+
+class ValidatorStore:
+    """Persistent ETag / Last-Modified validators, keyed by "agent/URL".
+
+    Validators are only recorded once a response has been parsed and stored,
+    so a run that dies half-way never turns an unsaved page into a 304.
+    They are kept per agent because agents can poll the same URL: one
+    agent storing a page must not turn it into a 304 for another that failed.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or _validators_path()
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries: dict[str, dict] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self._entries = {}
+        # Entries from before validators were per agent are keyed by the bare URL
+        for key in [key for key in self._entries if key.startswith(("http://", "https://"))]:
+            del self._entries[key]
+            self._dirty = True
+
+    @staticmethod
+    def key(agent_name: str, url: str) -> str:
+        return f"{agent_name}/{url}"
+
+    def request_headers(self, key: str) -> dict[str, str]:
+        """Conditional request headers for the key, empty if nothing is known."""
+        entry = self._entries.get(key, {})
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(self, key: str, response_headers: dict[str, str]):
+        """Remember the validators from lower-cased response headers."""
+        etag = response_headers.get("etag")
+        last_modified = response_headers.get("last-modified")
+        with self._lock:
+            if not etag and not last_modified:
+                if self._entries.pop(key, None) is not None:
+                    self._dirty = True
+                return
+            entry = {"etag": etag, "last_modified": last_modified}
+            if self._entries.get(key) != entry:
+                self._entries[key] = entry
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self._dirty = False
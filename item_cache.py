@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key       TEXT PRIMARY KEY,
+    value     BLOB NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+# SQLite's default limit on bound parameters is 999
+_QUERY_CHUNK = 900
+
+
+def item_key(kind: str, item: dict, params: str = "") -> str:
+    """Content hash of an item plus the settings the cached result depends on."""
+    payload = json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(f"{kind}\0{params}\0{payload}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ItemCache:
+    """Per-item results of digest preparation keyed by content hash, persisted
+    in DATA_DIR/item_cache.sqlite3 with least-recently-used eviction.
+
+    An in-memory LRU sits in front of the database so repeated digest builds
+    in one process don't touch SQLite at all.
+    """
+
+    def __init__(self, path: str | None = None, max_entries: int | None = None):
+        self.path = path or os.path.join(config.DATA_DIR, "item_cache.sqlite3")
+        self.max_entries = config.ITEM_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def _remember(self, key: str, value: bytes):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                value = self._memory.get(key)
+                if value is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    found[key] = value
+            if not missing:
+                return found
+            now = time.time()
+            with self._conn:
+                for i in range(0, len(missing), _QUERY_CHUNK):
+                    chunk = missing[i:i + _QUERY_CHUNK]
+                    marks = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(f"SELECT key, value FROM entries WHERE key IN ({marks})", chunk).fetchall()
+                    self._conn.execute(f"UPDATE entries SET last_used = ? WHERE key IN ({marks})", (now, *chunk))
+                    for key, value in rows:
+                        found[key] = value
+                        self._remember(key, value)
+        return found
+
+    def put_many(self, values: dict[str, bytes]):
+        if not values:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            for key, value in values.items():
+                self._remember(key, value)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, last_used) VALUES (?, ?, ?)",
+                ((key, value, now) for key, value in values.items()),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+
+_cache: ItemCache | None = None
+_cache_key: str | None = None
+
+
+def get_cache() -> ItemCache:
+    """Return the item cache for config.DATA_DIR, opened on first use."""
+    global _cache, _cache_key
+    if _cache is None or _cache_key != config.DATA_DIR:
+        _cache = ItemCache()
+        _cache_key = config.DATA_DIR
+    return _cache
@@ -0,0 +1,82 @@
+import re
+
+# How a keyword must sit in the text: as a whole word, at the start of a word
+# (so "scheme" also matches "schemes"), or anywhere (plain substring).
+BOUNDARIES = {
+    "word": (r"(?<!\w)", r"(?!\w)"),
+    "prefix": (r"(?<!\w)", ""),
+    "none": ("", ""),
+}
+
+
+def _trie_pattern(keywords: list[str]) -> str:
+    """Build a regex whose alternation branches share common prefixes.
+
+    The regex engine then follows a single path per text position instead of
+    retrying every keyword, which is what makes one pass cheaper than one
+    scan per keyword.
+    """
+    trie: dict = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        ends = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends:
+            # Longer keywords first; the bare prefix is a valid match too
+            if len(branches) == 1 and len(body) > 1:
+                body = "(?:" + body + ")"
+            body += "?"
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Finds any of a fixed list of keywords in text in a single pass.
+
+    The list is compiled once into a prefix-sharing, case-insensitive regex.
+    Use one instance per keyword list, at module level.
+    """
+
+    def __init__(self, keywords: list[str], boundary: str = "word"):
+        left, right = BOUNDARIES[boundary]
+        self.keywords = sorted({kw.lower() for kw in keywords if kw})
+        self._regex = re.compile(left + "(?:" + _trie_pattern(self.keywords) + ")" + right, re.IGNORECASE)
+        # Matched text -> configured keyword
+        self._canonical = {kw: kw for kw in self.keywords}
+
+    def _keyword(self, matched: str) -> str:
+        """The configured keyword a match stands for.
+
+        Case-insensitive matching also accepts characters whose lower() is
+        not the keyword's ("İ" for "i", "ſ" for "s"); those are resolved
+        once by re-matching against the keywords of the same length.
+        """
+        kw = self._canonical.get(matched) or self._canonical.get(matched.lower())
+        if kw is None:
+            kw = next(
+                k for k in self.keywords
+                if len(k) == len(matched) and re.fullmatch(re.escape(k), matched, re.IGNORECASE)
+            )
+            self._canonical[matched] = kw
+        return kw
+
+    def findall(self, text: str) -> list[str]:
+        """Every (non-overlapping) keyword occurrence in text order, as the configured (lower-cased) keyword."""
+        return [self._keyword(m.group()) for m in self._regex.finditer(text)]
+
+    def search(self, text: str) -> str | None:
+        """The first keyword occurring in the text, as the configured (lower-cased) keyword, or None."""
+        m = self._regex.search(text)
+        return self._keyword(m.group()) if m else None
+
+    def matches(self, text: str) -> bool:
+        return self._regex.search(text) is not None
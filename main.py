@@ -1,35 +1,103 @@
 import argparse
+import os
 import sys
+import tempfile
+import time
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-import emailer
-import formatter
+# Command modules (collector, formatter, ...) are imported by the command
+# that needs them, so e.g. --send never loads the HTTP client or parsers
+import config
 from agents import ALL_AGENTS, COLLECTIBLE_AGENTS
 
 
-def collect_all() -> int:
-    """Run collection for all collectible agents."""
-    total = 0
-    for name, agent_cls in COLLECTIBLE_AGENTS.items():
+def _collectible_agents() -> list:
+    agents = []
+    for name in COLLECTIBLE_AGENTS:
         try:
-            agent = agent_cls()
-            total += agent.collect()
+            agents.append(COLLECTIBLE_AGENTS[name]())
         except Exception as e:
             print(f"Error in {name} agent: {e}")
-    return total
+    return agents
 
 
-def collect_agent(name: str) -> int:
+def collect_all(workers: int | None = None, parse_workers: int | None = None) -> int:
+    """Run collection for all collectible agents, fetching their sources concurrently."""
+    import collector
+
+    return collector.run_agents(_collectible_agents(), workers, parse_workers)
+
+
+def collect_agent(name: str, workers: int | None = None, parse_workers: int | None = None) -> int:
     """Run collection for a single agent by name."""
-    agent_cls = ALL_AGENTS.get(name)
-    if not agent_cls:
-        print(f"Unknown agent: {name}. Available: {', '.join(ALL_AGENTS.keys())}", file=sys.stderr)
+    if name not in ALL_AGENTS:
+        print(f"Unknown agent: {name}. Available: {', '.join(ALL_AGENTS)}", file=sys.stderr)
         sys.exit(1)
-    agent = agent_cls()
-    return agent.collect()
+    agent = ALL_AGENTS[name]()
+    return agent.collect(workers, parse_workers)
+
+
+def send_digests() -> bool:
+    """Send today's digest to every subscription over one SMTP session and
+    report the outcome. Returns False if any digest could not be sent.
+
+    Sections are loaded once; with several recipients each item is also
+    rendered once, and every recipient's digest is assembled from those
+    shared fragments just before it is sent.
+    """
+    import emailer
+    import formatter
+    import subscriptions
+
+    subs = subscriptions.load_subscriptions()
+    if not subs:
+        print("Error: No recipients. Set RECIPIENT_EMAIL or create a subscriptions file.", file=sys.stderr)
+        return False
+    digest = formatter.SharedDigest(cache_fragments=len(subs) > 1)
+    recipients = []
+    for sub in subs:
+        # An empty store still sends the "run --collect" notice; a subscription matching nothing is skipped
+        if digest.sections and not digest.item_count(sub):
+            print(f"No items match {sub.email}'s subscription today; not sending")
+            continue
+        recipients.append(sub)
+    if not recipients:
+        print("No digest sent: no subscription matches today's items.")
+        return True
+    sent = emailer.send_messages(
+        (sub.email, digest.subject, digest.body(sub)) for sub in recipients
+    )
+    if sent < len(recipients):
+        print(f"Failed to send {len(recipients) - sent} of {len(recipients)} digests.", file=sys.stderr)
+        return False
+    print("Digest sent successfully.")
+    return True
+
+
+def search(query: str):
+    """Print the best full-text matches for a query over every collected item."""
+    import storage
+
+    start = time.perf_counter()
+    hits = storage.search(query)
+    elapsed = time.perf_counter() - start
+    for hit in hits:
+        print(f"{hit.score:6.2f}  {hit.day}  {hit.agent:8s} {hit.title}")
+        print(f"{'':26s} {hit.link}")
+    print(f"{len(hits) or 'No'} match{'' if len(hits) == 1 else 'es'} ({elapsed * 1000:.1f} ms)")
+
+
+def run_daemon(workers: int | None = None, parse_workers: int | None = None):
+    """Poll every source on its own interval and send the digest daily until SIGTERM."""
+    import asyncio
+
+    import daemon
+
+    scheduler = daemon.Scheduler(_collectible_agents(), send_digests, workers, parse_workers)
+    asyncio.run(scheduler.run())
 
 
 def main():
@@ -37,35 +105,78 @@ def main():
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument("--collect", action="store_true", help="Collect all agents")
     group.add_argument("--collect-agent", metavar="NAME", help="Collect a specific agent (news, papers, grants, funding, github)")
-    group.add_argument("--send", action="store_true", help="Send the unified digest email now")
+    group.add_argument("--send", action="store_true", help="Send the digest to every subscription now")
     group.add_argument("--daily", action="store_true", help="Collect all agents then send digest")
+    group.add_argument("--daemon", action="store_true", help=f"Keep running: poll sources on their intervals and send the digest at {config.DIGEST_TIME}")
+    group.add_argument("--compact", action="store_true", help="Compact stored items (jsonl backend folds in old JSON day files)")
+    group.add_argument("--health", action="store_true", help="Show each source's fetch health and circuit state")
+    group.add_argument("--serve", action="store_true", help=f"Serve the digest and stored items over local HTTP (port {config.SERVE_PORT})")
+    group.add_argument("--search", metavar="QUERY", help="Search everything collected, across agents and dates (word* matches a prefix)")
+    parser.add_argument("--workers", type=int, metavar="N", help=f"Sources fetched in parallel (default {config.COLLECT_WORKERS})")
+    parser.add_argument("--parse-workers", type=int, metavar="N", help=f"Parser processes, 0 for in-process threads (default {config.PARSE_WORKERS})")
+    http_mode = parser.add_mutually_exclusive_group()
+    http_mode.add_argument("--record", metavar="DIR", help="Save every HTTP response into DIR while collecting")
+    http_mode.add_argument("--replay", metavar="DIR", help="Collect offline from responses recorded with --record")
+    parser.add_argument("--faults", metavar="FILE", help="With --replay: per-host synthetic latency/errors (JSON, see config.py)")
+    parser.add_argument("--data-dir", metavar="DIR", help="Store everything in DIR instead of data/ (a --replay run defaults to a fresh temporary directory)")
 
     args = parser.parse_args()
+    if args.faults and not args.replay:
+        parser.error("--faults requires --replay")
+    if args.data_dir:
+        config.DATA_DIR = args.data_dir
+    if args.record:
+        config.HTTP_RECORD_DIR = args.record
+    if args.replay:
+        config.HTTP_REPLAY_DIR = args.replay
+        config.REPLAY_FAULTS_FILE = args.faults or config.REPLAY_FAULTS_FILE
+    if config.HTTP_REPLAY_DIR:
+        # Replay every recorded source, and keep the live poll history and health out of it
+        config.ADAPTIVE_POLLING = False
+        config.SOURCE_HEALTH = False
+        # A replay must neither write into the real history nor be deduplicated against it
+        if not args.data_dir and not os.getenv("DATA_DIR"):
+            config.DATA_DIR = tempfile.mkdtemp(prefix="replay-data-")
+            print(f"Replay: storing into {config.DATA_DIR} (choose with --data-dir)")
 
     if args.collect:
-        count = collect_all()
+        count = collect_all(args.workers, args.parse_workers)
         print(f"Done. {count} new items collected across all agents.")
 
     elif args.collect_agent:
-        count = collect_agent(args.collect_agent)
+        count = collect_agent(args.collect_agent, args.workers, args.parse_workers)
         print(f"Done. {count} new items collected by {args.collect_agent} agent.")
 
+    elif args.daemon:
+        run_daemon(args.workers, args.parse_workers)
+
+    elif args.compact:
+        import storage
+
+        storage.compact()
+        print("Storage compacted.")
+
+    elif args.health:
+        import health
+
+        print(health.format_report(health.SourceHealth()))
+
+    elif args.serve:
+        import server
+
+        server.serve()
+
+    elif args.search:
+        search(args.search)
+
     elif args.send:
-        subject, html_body = formatter.format_digest()
-        if emailer.send_email(subject, html_body):
-            print("Digest sent successfully.")
-        else:
-            print("Failed to send digest.", file=sys.stderr)
+        if not send_digests():
             sys.exit(1)
 
     elif args.daily:
-        count = collect_all()
+        count = collect_all(args.workers, args.parse_workers)
         print(f"Collected {count} new items across all agents.")
-        subject, html_body = formatter.format_digest()
-        if emailer.send_email(subject, html_body):
-            print("Digest sent successfully.")
-        else:
-            print("Failed to send digest.", file=sys.stderr)
+        if not send_digests():
             sys.exit(1)
 
 
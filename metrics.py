@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+import config
+
+# Counters of the parse running on this thread (see parse_scope)
+_parse_local = threading.local()
+
+
+@contextmanager
+def parse_scope() -> Iterator[dict[str, int]]:
+    """Collect count() calls made by the parse running on this thread."""
+    counts: dict[str, int] = {}
+    _parse_local.counts = counts
+    try:
+        yield counts
+    finally:
+        _parse_local.counts = None
+
+
+def count(reason: str, n: int = 1):
+    """Count items a parser dropped, by reason ("seen", "old", "duplicate"...).
+    A no-op outside parse_scope()."""
+    counts = getattr(_parse_local, "counts", None)
+    if counts is not None and n:
+        counts[reason] = counts.get(reason, 0) + n
+
+
+@dataclass
+class SourceMetrics:
+    agent: str
+    source: str
+    # HTTP status of the last response, 0 if no response came back
+    status: int = 0
+    error: str = ""
+    fetch_seconds: float = 0.0
+    bytes: int = 0
+    parse_seconds: float = 0.0
+    found: int = 0
+    # Items the parser dropped, by reason
+    skipped: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+@dataclass
+class AgentMetrics:
+    agent: str
+    found: int = 0
+    new: int = 0
+    write_seconds: float = 0.0
+    writes: int = 0
+
+    @property
+    def deduped(self) -> int:
+        """Items found but already stored (same day or, with CROSS_DAY_DEDUP, earlier)."""
+        return self.found - self.new
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class RunMetrics:
+    """Structured measurements of one collection run (or daemon round).
+
+    The pipeline fills per-source fetch/parse numbers and per-agent store
+    numbers (storage writes are batched per agent); write() exports them as
+    a Prometheus text-format file and a JSON run summary.
+    """
+
+    def __init__(self, fetch_stats=None):
+        self.started = time.time()
+        self.finished: float | None = None
+        self.sources: dict[tuple[str, str], SourceMetrics] = {}
+        self.agents: dict[str, AgentMetrics] = {}
+        self.http: dict[str, int] = {}
+        # A long-lived fetcher's counters when the run began, so finish() reports this run's share
+        self._http_baseline = asdict(fetch_stats) if fetch_stats is not None else {}
+
+    def source(self, agent_name: str, source_name: str) -> SourceMetrics:
+        key = (agent_name, source_name)
+        if key not in self.sources:
+            self.sources[key] = SourceMetrics(agent_name, source_name)
+        return self.sources[key]
+
+    def agent(self, agent_name: str) -> AgentMetrics:
+        if agent_name not in self.agents:
+            self.agents[agent_name] = AgentMetrics(agent_name)
+        return self.agents[agent_name]
+
+    def finish(self, fetch_stats=None):
+        self.finished = time.time()
+        if fetch_stats is not None:
+            self.http = {k: v - self._http_baseline.get(k, 0) for k, v in asdict(fetch_stats).items()}
+
+    @property
+    def duration(self) -> float:
+        return (self.finished or time.time()) - self.started
+
+    def to_prometheus(self) -> str:
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples):
+            lines.append(f"# HELP digest_{name} {help_text}")
+            lines.append(f"# TYPE digest_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"digest_{name}{_labels(**labels)} {value}")
+
+        sources = sorted(self.sources.values(), key=lambda m: (m.agent, m.source))
+        agents = sorted(self.agents.values(), key=lambda m: m.agent)
+
+        def per_source(attr):
+            return [({"agent": m.agent, "source": m.source}, getattr(m, attr)) for m in sources]
+
+        def per_agent(attr):
+            return [({"agent": m.agent}, getattr(m, attr)) for m in agents]
+
+        metric("run_timestamp_seconds", "gauge", "When the run started.", [({}, round(self.started, 3))])
+        metric("run_duration_seconds", "gauge", "Wall time of the run.", [({}, round(self.duration, 3))])
+        metric("source_up", "gauge", "1 if the source was fetched and parsed without error.",
+               [({"agent": m.agent, "source": m.source}, int(m.ok)) for m in sources])
+        metric("source_http_status", "gauge", "HTTP status of the source's response (0 = none).", per_source("status"))
+        metric("source_fetch_seconds", "gauge", "Request time of the source's response.", per_source("fetch_seconds"))
+        metric("source_bytes", "gauge", "Bytes downloaded for the source.", per_source("bytes"))
+        metric("source_parse_seconds", "gauge", "Time spent parsing the source.", per_source("parse_seconds"))
+        metric("source_items_found", "gauge", "Items the source's parser produced.", per_source("found"))
+        metric("source_items_skipped", "gauge", "Items the parser dropped, by reason.", [
+            ({"agent": m.agent, "source": m.source, "reason": reason}, n)
+            for m in sources for reason, n in sorted(m.skipped.items())
+        ])
+        metric("agent_items_found", "gauge", "Items handed to storage.", per_agent("found"))
+        metric("agent_items_new", "gauge", "Items storage added.", per_agent("new"))
+        metric("agent_items_deduped", "gauge", "Items storage already had.", per_agent("deduped"))
+        metric("agent_write_seconds", "gauge", "Time spent in storage writes.", per_agent("write_seconds"))
+        if self.http:
+            metric("http_events", "gauge", "HTTP client counters for the run.",
+                   [({"event": name}, value) for name, value in sorted(self.http.items())])
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict:
+        sources = []
+        for m in sorted(self.sources.values(), key=lambda m: m.fetch_seconds + m.parse_seconds, reverse=True):
+            entry = asdict(m)
+            entry["ok"] = m.ok
+            sources.append(entry)
+        return {
+            "started": self.started,
+            "duration_seconds": round(self.duration, 3),
+            "http": self.http,
+            "agents": {
+                m.agent: {**asdict(m), "deduped": m.deduped} for m in sorted(self.agents.values(), key=lambda m: m.agent)
+            },
+            # Slowest first
+            "sources": sources,
+        }
+
+    def write(self, directory: str | None = None):
+        """Write metrics.prom and run_summary.json (atomically) into METRICS_DIR."""
+        directory = directory or config.METRICS_DIR or os.path.join(config.DATA_DIR, "metrics")
+        os.makedirs(directory, exist_ok=True)
+        for filename, text in (
+            ("metrics.prom", self.to_prometheus()),
+            ("run_summary.json", json.dumps(self.summary(), indent=2, ensure_ascii=False)),
+        ):
+            path = os.path.join(directory, filename)
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, path)
@@ -0,0 +1,77 @@
+import re
+
+import numpy as np
+
+import config
+from keywords import KeywordMatcher
+
+_WORD = re.compile(r"\w+")
+_TAG = re.compile(r"<[^>]+>")
+
+_matchers: dict[tuple[str, ...], tuple[KeywordMatcher, dict[str, int]]] = {}
+
+
+def _matcher(keywords: list[str]) -> tuple[KeywordMatcher, dict[str, int]]:
+    key = tuple(keywords)
+    if key not in _matchers:
+        matcher = KeywordMatcher(keywords, boundary="word")
+        _matchers[key] = (matcher, {kw: i for i, kw in enumerate(matcher.keywords)})
+    return _matchers[key]
+
+
+def _source_weight(item: dict) -> float:
+    sources = item.get("sources") or [item.get("source", "")]
+    return max(config.SOURCE_WEIGHTS.get(s, 1.0) for s in sources)
+
+
+def bm25_scores(items: list[dict], keywords: list[str]) -> np.ndarray:
+    """Score each item's title and summary against the keyword set with BM25.
+
+    Every keyword (including multi-word phrases) is one query term; a title
+    hit counts TITLE_WEIGHT times. IDF comes from the items themselves, so
+    keywords that appear everywhere ("ai") weigh less than rare ones. Scores
+    are multiplied by the item's source weight (config.SOURCE_WEIGHTS).
+    """
+    matcher, term_index = _matcher(keywords)
+    n_docs, n_terms = len(items), len(term_index)
+    tf = np.zeros((n_docs, n_terms), dtype=np.float64)
+    doc_len = np.empty(n_docs, dtype=np.float64)
+    rows, cols, weights = [], [], []
+    for i, item in enumerate(items):
+        title = item.get("title", item.get("name", ""))
+        summary = _TAG.sub(" ", item.get("summary", item.get("description", "")))
+        doc_len[i] = len(_WORD.findall(title)) * config.TITLE_WEIGHT + len(_WORD.findall(summary))
+        for text, weight in ((title, config.TITLE_WEIGHT), (summary, 1.0)):
+            for kw in matcher.findall(text):
+                rows.append(i)
+                cols.append(term_index[kw])
+                weights.append(weight)
+    if rows:
+        np.add.at(tf, (np.array(rows), np.array(cols)), np.array(weights))
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+    avg_len = doc_len.mean() if n_docs and doc_len.mean() > 0 else 1.0
+    k1, b = config.BM25_K1, config.BM25_B
+    norm = k1 * (1 - b + b * doc_len / avg_len)
+    scores = (tf * (k1 + 1) / (tf + norm[:, None]) * idf).sum(axis=1)
+
+    source_weights = np.fromiter((_source_weight(item) for item in items), dtype=np.float64, count=n_docs)
+    return scores * source_weights
+
+
+def rank_items(items: list[dict], keywords: list[str], limit: int | None = None) -> list[dict]:
+    """Return items ordered by BM25 relevance (ties keep their order), cut to `limit`."""
+    if not items:
+        return items
+    order = np.argsort(-bm25_scores(items, keywords), kind="stable")
+    if limit is not None:
+        order = order[:limit]
+    return [items[i] for i in order]
+
+
+def order_section(agent_name: str, items: list[dict]) -> list[dict]:
+    """Rank a digest section by its configured keyword set. Not capped: the digest
+    cuts each recipient's filtered selection to SECTION_LIMITS."""
+    keywords = config.RANK_KEYWORDS.get(agent_name)
+    return rank_items(items, keywords) if keywords else items
@@ -0,0 +1,38 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+import config
+
+
+class HostRateLimiter:
+    """Spaces out requests to the same host while leaving other hosts untouched.
+
+    Each host gets its own "next free slot". Callers reserve a slot under a
+    lock and then sleep outside it, so a wait on one host never blocks a
+    request to another.
+    """
+
+    def __init__(self, min_interval: float | None = None):
+        self.min_interval = config.HOST_MIN_INTERVAL if min_interval is None else min_interval
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def reserve(self, url: str) -> float:
+        """Reserve the next slot for the URL's host. Returns seconds to wait."""
+        host = self.host_of(url)
+        now = time.monotonic()
+        with self._lock:
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        return slot - now
+
+    async def wait_async(self, url: str):
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
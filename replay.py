@@ -0,0 +1,168 @@
+"""Record HTTP responses and replay them offline.
+
+--record wraps the live transport and saves every response (final URL,
+status, headers, body) into a cassette directory. --replay serves a run from
+that directory with no network access, so collection is deterministic and
+the agents run unchanged. Unless --data-dir (or DATA_DIR) names one, a
+replay stores into a fresh temporary directory, so it never touches the
+live history and runs the same every time. During replay, per-host synthetic latency, error
+responses and timeouts (--faults) load-test the fetcher's concurrency,
+retries and timeout handling.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, fields
+from urllib.parse import urlsplit
+
+import config
+from fetcher import AiohttpTransport, FetchResult, FetchStats
+
+
+class Cassette:
+    """A directory of recorded responses, one <key>.json + <key>.body pair per URL."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.blake2b(url.encode("utf-8"), digest_size=12).hexdigest()
+
+    def _path(self, url: str, ext: str) -> str:
+        return os.path.join(self.directory, f"{self.key(url)}.{ext}")
+
+    def save(self, url: str, result: FetchResult):
+        os.makedirs(self.directory, exist_ok=True)
+        meta = {"url": url, "final_url": result.url, "status": result.status, "headers": result.headers}
+        # Body first: a .json file only ever points at a complete body
+        for path, data, mode in (
+            (self._path(url, "body"), result.body, "wb"),
+            (self._path(url, "json"), json.dumps(meta, indent=2, ensure_ascii=False).encode("utf-8"), "wb"),
+        ):
+            tmp = path + ".tmp"
+            with open(tmp, mode) as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+    def load(self, url: str) -> FetchResult | None:
+        try:
+            with open(self._path(url, "json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(self._path(url, "body"), "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        return FetchResult(meta["final_url"], meta["status"], body, meta["headers"])
+
+
+class RecordingTransport:
+    """Pass requests to the live transport and save each response."""
+
+    def __init__(self, inner, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+        self.recorded = 0
+
+    async def open(self, stats: FetchStats):
+        await self.inner.open(stats)
+
+    async def close(self):
+        await self.inner.close()
+        print(f"Recorded {self.recorded} responses to {self.cassette.directory}")
+
+    async def get(self, url: str, headers: dict[str, str] | None = None) -> FetchResult:
+        result = await self.inner.get(url, headers)
+        self.cassette.save(url, result)
+        self.recorded += 1
+        return result
+
+
+@dataclass
+class HostFaults:
+    # Seconds added to every response, plus up to `jitter` more
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Fraction of requests answered with error_status
+    error_rate: float = 0.0
+    error_status: int = 503
+    # Fraction of requests that hang for READ_TIMEOUT and then time out
+    timeout_rate: float = 0.0
+
+
+def load_faults(path: str) -> dict[str, HostFaults]:
+    """Read a faults file: {host or "*": {HostFaults field: value}}."""
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    known = {f.name for f in fields(HostFaults)}
+    faults = {}
+    for host, spec in raw.items():
+        unknown = set(spec) - known
+        if unknown:
+            raise ValueError(f"{path}: unknown fault settings for {host}: {', '.join(sorted(unknown))}")
+        faults[host.lower()] = HostFaults(**spec)
+    return faults
+
+
+class ReplayTransport:
+    """Serve recorded responses, applying per-host synthetic faults.
+
+    Unrecorded URLs get a 404. Fault decisions are drawn from a generator
+    seeded with REPLAY_SEED, the URL and how often it has been requested,
+    so a replay behaves the same however its requests interleave.
+    """
+
+    def __init__(self, cassette: Cassette, faults: dict[str, HostFaults] | None = None, seed: int | None = None):
+        self.cassette = cassette
+        self.faults = faults or {}
+        self.seed = config.REPLAY_SEED if seed is None else seed
+        self._requests: dict[str, int] = {}
+        self.missing: set[str] = set()
+
+    def _host_faults(self, url: str) -> HostFaults | None:
+        host = (urlsplit(url).hostname or "").lower()
+        # Longest matching domain wins, then the "*" default
+        for name in sorted(self.faults, key=len, reverse=True):
+            if name != "*" and (host == name or host.endswith("." + name)):
+                return self.faults[name]
+        return self.faults.get("*")
+
+    async def open(self, stats: FetchStats):
+        pass
+
+    async def close(self):
+        if self.missing:
+            print(f"Replay: {len(self.missing)} URLs were not in {self.cassette.directory} (answered 404)")
+
+    async def get(self, url: str, headers: dict[str, str] | None = None) -> FetchResult:
+        start = time.perf_counter()
+        n = self._requests[url] = self._requests.get(url, 0) + 1
+        rng = random.Random(f"{self.seed}:{n}:{url}")
+        fault = self._host_faults(url)
+        if fault is not None:
+            if rng.random() < fault.timeout_rate:
+                await asyncio.sleep(config.READ_TIMEOUT)
+                raise asyncio.TimeoutError(f"replay: injected timeout for {url}")
+            await asyncio.sleep(fault.latency + rng.uniform(0, fault.jitter))
+            if rng.random() < fault.error_rate:
+                return FetchResult(url, fault.error_status, b"", {}, time.perf_counter() - start)
+
+        result = self.cassette.load(url)
+        if result is None:
+            if url not in self.missing:
+                self.missing.add(url)
+                print(f"  Replay: no recording for {url}")
+            return FetchResult(url, 404, b"", {}, time.perf_counter() - start)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+
+def transport_from_config():
+    """The transport for HTTP_RECORD_DIR / HTTP_REPLAY_DIR (replay wins if both are set)."""
+    if config.HTTP_REPLAY_DIR:
+        faults = load_faults(config.REPLAY_FAULTS_FILE) if config.REPLAY_FAULTS_FILE else None
+        return ReplayTransport(Cassette(config.HTTP_REPLAY_DIR), faults)
+    return RecordingTransport(AiohttpTransport(), Cassette(config.HTTP_RECORD_DIR))
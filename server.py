@@ -0,0 +1,239 @@
+"""Local HTTP server behind `--serve`.
+
+    GET /                               today's digest (HTML)
+    GET /digest/YYYY-MM-DD              that day's digest
+    GET /api/items/<agent>[?date=YYYY-MM-DD]
+                                        an agent's stored items (JSON, default today)
+    GET /api/search?q=QUERY[&agent=NAME]
+                                        full-text hits (JSON)
+
+Past days are read from the live store or, once expired, from the archive;
+a past day found in neither is a 404. Every response carries an ETag
+derived from the storage state it was built from (storage.day_version,
+which covers both, or the search index version), so checking whether a
+cached page is current costs a few stat calls, never a re-read. Pages are
+rendered on first request and served from memory until that state changes;
+If-None-Match requests for an unchanged page get 304 without any rendering.
+"""
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import config
+import formatter
+import storage
+from agents import ALL_AGENTS
+
+# Responses smaller than this are sent uncompressed
+_GZIP_MIN_BYTES = 1024
+
+
+class _Page:
+    def __init__(self, etag: str, body: bytes, content_type: str):
+        self.etag = etag
+        self.body = body
+        self.content_type = content_type
+        self._gzipped: bytes | None = None
+
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self._gzipped
+
+
+class ResponseCache:
+    """Rendered pages keyed by path, each valid while its ETag is unchanged.
+
+    A stale or missing page is rendered by one thread while concurrent
+    requests for the same page wait for it instead of rendering it again.
+    Holds at most SERVE_CACHE_ENTRIES pages, least recently used dropped first.
+    """
+
+    def __init__(self, max_entries: int | None = None):
+        self.max_entries = max_entries or config.SERVE_CACHE_ENTRIES
+        self._pages: OrderedDict[str, _Page] = OrderedDict()
+        self._lock = threading.Lock()
+        self._render_locks: dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.renders = 0
+
+    def _current(self, key: str, etag: str) -> _Page | None:
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None or page.etag != etag:
+                return None
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def get(self, key: str, etag: str, render, content_type: str) -> _Page:
+        page = self._current(key, etag)
+        if page is not None:
+            return page
+        with self._lock:
+            render_lock = self._render_locks.setdefault(key, threading.Lock())
+        with render_lock:
+            page = self._current(key, etag)
+            if page is not None:
+                return page
+            page = _Page(etag, render(), content_type)
+            with self._lock:
+                self.renders += 1
+                self._pages[key] = page
+                self._pages.move_to_end(key)
+                while len(self._pages) > self.max_entries:
+                    evicted, _ = self._pages.popitem(last=False)
+                    self._render_locks.pop(evicted, None)
+            return page
+
+
+def _etag(*parts: str) -> str:
+    return '"' + hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+
+def _json(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str = ""):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+def _parse_date(value: str | None) -> datetime:
+    if not value:
+        return datetime.now()
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise _HTTPError(HTTPStatus.BAD_REQUEST, f"Bad date {value!r}, expected YYYY-MM-DD") from None
+
+
+class DigestServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int]):
+        super().__init__(address, _Handler)
+        self.cache = ResponseCache()
+        # Part of every ETag, so a restart (possibly with other settings) never revalidates old pages
+        self.instance = f"{time.time_ns()}"
+
+    def resolve(self, path: str, query: dict[str, list[str]]) -> tuple[str, str, object, str]:
+        """(cache key, ETag, render function, content type) of a request path.
+        Only the ETag is computed here, from the storage state the page depends on."""
+        parts = [p for p in path.split("/") if p]
+        if not parts or (parts[0] == "digest" and len(parts) == 2):
+            return self._digest(_parse_date(parts[1] if parts else None))
+        if parts[:2] == ["api", "items"] and len(parts) == 3:
+            return self._items(parts[2], _parse_date(query.get("date", [None])[0]))
+        if parts == ["api", "search"] and config.SEARCH_INDEX:
+            return self._search(query.get("q", [""])[0], query.get("agent", [None])[0])
+        raise _HTTPError(HTTPStatus.NOT_FOUND)
+
+    @staticmethod
+    def _require_day(agent_names: list[str], date: datetime):
+        # Today may just not be collected yet; a past day must be stored or archived
+        if date.date() < datetime.now().date() and not any(storage.has_day(name, date) for name in agent_names):
+            raise _HTTPError(HTTPStatus.NOT_FOUND, f"Nothing stored for {date:%Y-%m-%d}")
+
+    def _digest(self, date: datetime):
+        day = date.strftime("%Y-%m-%d")
+        self._require_day([agent_name for agent_name, _, _ in formatter.SECTIONS], date)
+        versions = [storage.day_version(agent_name, date) for agent_name, _, _ in formatter.SECTIONS]
+        return (
+            f"digest/{day}", _etag(self.instance, "digest", day, *versions),
+            lambda: formatter.format_digest(date)[1].encode("utf-8"), "text/html; charset=utf-8",
+        )
+
+    def _items(self, agent_name: str, date: datetime):
+        if agent_name not in ALL_AGENTS:
+            raise _HTTPError(HTTPStatus.NOT_FOUND, f"Unknown agent: {agent_name}")
+        day = date.strftime("%Y-%m-%d")
+        self._require_day([agent_name], date)
+        version = storage.day_version(agent_name, date)
+        return (
+            f"items/{agent_name}/{day}", _etag(self.instance, "items", agent_name, day, version),
+            lambda: _json(storage.load_range(agent_name, date, date)), "application/json",
+        )
+
+    def _search(self, text: str, agent_name: str | None):
+        index = storage.get_search_index()
+        return (
+            f"search/{agent_name}/{text}", _etag(self.instance, "search", agent_name or "", text, index.version()),
+            lambda: _json([asdict(hit) for hit in index.search(text, agent_name=agent_name)]), "application/json",
+        )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: DigestServer
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, send_body: bool):
+        url = urlsplit(self.path)
+        try:
+            key, etag, render, content_type = self.server.resolve(url.path, parse_qs(url.query))
+            headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+            if etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+                self._send(HTTPStatus.NOT_MODIFIED, b"", None, False, headers)
+                return
+            page = self.server.cache.get(key, etag, render, content_type)
+        except _HTTPError as e:
+            self._send(e.status, _json({"error": str(e)}), "application/json", send_body)
+            return
+        except Exception as e:
+            print(f"  Error serving {self.path}: {e}")
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, _json({"error": "internal error"}), "application/json", send_body)
+            return
+
+        body = page.body
+        if len(body) >= _GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = page.gzipped()
+            headers["Content-Encoding"] = "gzip"
+        self._send(HTTPStatus.OK, body, page.content_type, send_body, headers)
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str | None, send_body: bool, headers=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def log_message(self, format: str, *args):
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {self.address_string()} {format % args}")
+
+
+def serve(host: str | None = None, port: int | None = None):
+    """Serve until interrupted."""
+    host = host or config.SERVE_HOST
+    port = config.SERVE_PORT if port is None else port
+    # Create the shared storage objects before request threads race to
+    storage.get_backend()
+    if config.SEARCH_INDEX:
+        storage.get_search_index()
+    with DigestServer((host, port)) as httpd:
+        print(f"Serving the digest on http://{host}:{httpd.server_address[1]}/ (Ctrl+C to stop)")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        print(f"Stopped. {httpd.cache.renders} renders, {httpd.cache.hits} cache hits.")
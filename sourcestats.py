@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import config
+
+
+def _stats_path() -> str:
+    return os.path.join(config.DATA_DIR, "source_stats.json")
+
+
+def _link_hash(link: str) -> str:
+    return hashlib.blake2b(link.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def base_interval(agent_name: str, source: dict) -> float:
+    """Configured seconds between polls of a source, before adaptation."""
+    return source.get("interval") or config.POLL_INTERVALS.get(agent_name, config.DEFAULT_POLL_INTERVAL)
+
+
+def next_interval(current: float, base: float, changed: bool) -> float:
+    """Polling policy: back off geometrically while a source stays unchanged
+    (up to POLL_MAX_FACTOR x base), and tighten when it changes, first
+    dropping back to base, then down to POLL_MIN_FACTOR x base while it keeps
+    changing."""
+    if changed:
+        return max(base * config.POLL_MIN_FACTOR, min(current, base) / config.POLL_BACKOFF)
+    return min(base * config.POLL_MAX_FACTOR, current * config.POLL_BACKOFF)
+
+
+class SourceStats:
+    """Persistent per-source polling statistics, keyed by "agent/source name".
+
+    Each entry tracks polls, failures, new items seen (links not present in
+    the source's previous poll), an exponentially weighted new-items-per-poll
+    rate, the last poll and last change times, and the adaptive interval the
+    polling policy derived from them.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or _stats_path()
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries: dict[str, dict] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self._entries = {}
+
+    @staticmethod
+    def key(agent_name: str, source: dict) -> str:
+        return f"{agent_name}/{source['name']}"
+
+    def get(self, agent_name: str, source: dict) -> dict:
+        return self._entries.get(self.key(agent_name, source), {})
+
+    def entries(self) -> dict[str, dict]:
+        return dict(self._entries)
+
+    def interval(self, agent_name: str, source: dict) -> float:
+        """Current adaptive interval of a source (its base interval until first polled)."""
+        return self.get(agent_name, source).get("interval") or base_interval(agent_name, source)
+
+    def is_due(self, agent_name: str, source: dict, now: float | None = None) -> bool:
+        entry = self.get(agent_name, source)
+        if "last_poll" not in entry:
+            return True
+        now = time.time() if now is None else now
+        slack = 1 - config.POLL_DUE_SLACK
+        return now >= entry["last_poll"] + self.interval(agent_name, source) * slack
+
+    def _update(self, agent_name: str, source: dict, changed: bool, new_items: int, failed: bool, links=None):
+        now = time.time()
+        base = base_interval(agent_name, source)
+        with self._lock:
+            entry = self._entries.setdefault(self.key(agent_name, source), {
+                "polls": 0, "failures": 0, "consecutive_failures": 0,
+                "new_items": 0, "rate": 0.0, "interval": base,
+            })
+            entry["polls"] += 1
+            entry["last_poll"] = now
+            if failed:
+                entry["failures"] += 1
+                entry["consecutive_failures"] += 1
+            else:
+                entry["consecutive_failures"] = 0
+                alpha = config.POLL_RATE_ALPHA
+                entry["rate"] = round((1 - alpha) * entry["rate"] + alpha * new_items, 4)
+                entry["new_items"] += new_items
+            if changed:
+                entry["last_change"] = now
+            if links is not None:
+                entry["links"] = links
+            entry["interval"] = round(next_interval(entry["interval"], base, changed), 1)
+            self._dirty = True
+
+    def record_items(self, agent_name: str, source: dict, items: list[dict]):
+        """Record a successful poll; items whose links the previous poll didn't return count as new."""
+        links = sorted({_link_hash(item["link"]) for item in items if item.get("link")})
+        previous = set(self.get(agent_name, source).get("links", []))
+        new_items = sum(1 for h in links if h not in previous)
+        self._update(agent_name, source, changed=new_items > 0, new_items=new_items, failed=False, links=links)
+
+    def record_unchanged(self, agent_name: str, source: dict):
+        """Record a poll answered with 304 Not Modified."""
+        self._update(agent_name, source, changed=False, new_items=0, failed=False)
+
+    def record_failure(self, agent_name: str, source: dict):
+        self._update(agent_name, source, changed=False, new_items=0, failed=True)
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self._dirty = False
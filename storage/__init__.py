@@ -0,0 +1,192 @@
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+import config
+from storage.archive import ItemArchive
+from storage.base_backend import StorageBackend
+from storage.json_backend import JsonBackend, agent_data_dir
+from storage.jsonl_backend import JsonlBackend
+from storage.search_index import SearchHit, SearchIndex
+from storage.seen_index import SeenIndex
+from storage.sqlite_backend import SqliteBackend
+
+BACKENDS = {
+    "json": JsonBackend,
+    "jsonl": JsonlBackend,
+    "sqlite": SqliteBackend,
+}
+
+_backend: StorageBackend | None = None
+_backend_key: tuple | None = None
+_seen: SeenIndex | None = None
+_seen_key: str | None = None
+_archive: ItemArchive | None = None
+_archive_key: str | None = None
+_search: SearchIndex | None = None
+_search_key: str | None = None
+
+
+def get_backend() -> StorageBackend:
+    """Return the backend selected by config.STORAGE_BACKEND, created on first use."""
+    global _backend, _backend_key
+    key = (config.STORAGE_BACKEND, config.DATA_DIR)
+    if _backend is None or _backend_key != key:
+        backend_cls = BACKENDS.get(config.STORAGE_BACKEND)
+        if backend_cls is None:
+            raise ValueError(f"Unknown storage backend: {config.STORAGE_BACKEND}. Available: {', '.join(BACKENDS)}")
+        _backend = backend_cls()
+        _backend_key = key
+    return _backend
+
+
+def get_seen_index() -> SeenIndex:
+    """Return the cross-day seen-link index for config.DATA_DIR, loaded on first use."""
+    global _seen, _seen_key
+    if _seen is None or _seen_key != config.DATA_DIR:
+        _seen = SeenIndex()
+        _seen_key = config.DATA_DIR
+    return _seen
+
+
+def get_archive() -> ItemArchive:
+    """Return the compressed archive of expired days for config.DATA_DIR."""
+    global _archive, _archive_key
+    if _archive is None or _archive_key != config.DATA_DIR:
+        _archive = ItemArchive()
+        _archive_key = config.DATA_DIR
+    return _archive
+
+
+def get_search_index() -> SearchIndex:
+    """Return the full-text index for config.DATA_DIR. A new index is first
+    filled from everything already stored and archived."""
+    global _search, _search_key
+    if _search is None or _search_key != config.DATA_DIR:
+        _search = SearchIndex()
+        _search_key = config.DATA_DIR
+        if _search.created:
+            _reindex(_search)
+    return _search
+
+
+def _reindex(index: SearchIndex):
+    archive = get_archive()
+    for agent, day in archive.stored_days():
+        index.add(agent, archive.load_range(agent, day, day), day)
+    backend = get_backend()
+    for agent, day in backend.stored_days(None):
+        index.add(agent, backend.load_articles(agent, day), day)
+
+
+def search(query: str, limit: int | None = None, agent_name: str | None = None) -> list[SearchHit]:
+    """Ranked full-text hits over every collected item, across agents and days."""
+    return get_search_index().search(query, limit, agent_name)
+
+
+def seen_before(agent_name: str, link: str, date: datetime | None = None) -> bool:
+    """True if the agent already collected this link on an earlier day (within retention)."""
+    if not config.CROSS_DAY_DEDUP:
+        return False
+    if date is None:
+        date = datetime.now()
+    return get_seen_index().seen_before(agent_name, link, date)
+
+
+def load_articles(agent_name: str, date: datetime | None = None) -> list[dict]:
+    if date is None:
+        date = datetime.now()
+    return get_backend().load_articles(agent_name, date)
+
+
+def iter_articles(agent_name: str, date: datetime | None = None) -> Iterator[dict]:
+    """Yield an agent's articles for one day without necessarily loading them all at once."""
+    if date is None:
+        date = datetime.now()
+    return get_backend().iter_articles(agent_name, date)
+
+
+def day_version(agent_name: str, date: datetime | None = None) -> str:
+    """A cheap token that changes whenever the agent's stored or archived items for the day change."""
+    if date is None:
+        date = datetime.now()
+    entry = get_archive().day_entry(agent_name, date)
+    archived = f"{entry['offset']}:{entry['length']}" if entry else "-"
+    return f"{get_backend().day_version(agent_name, date)}|{archived}"
+
+
+def has_day(agent_name: str, date: datetime) -> bool:
+    """True if the agent has items for the day, stored or archived."""
+    return get_backend().has_day(agent_name, date) or get_archive().day_entry(agent_name, date) is not None
+
+
+def save_articles(agent_name: str, articles: list[dict], date: datetime | None = None):
+    if date is None:
+        date = datetime.now()
+    get_backend().save_articles(agent_name, articles, date)
+    if config.SEARCH_INDEX:
+        get_search_index().add(agent_name, articles, date)
+
+
+def add_articles(agent_name: str, new_articles: list[dict], date: datetime | None = None) -> int:
+    """Add articles, deduplicating by URL within the day and, with CROSS_DAY_DEDUP,
+    against links collected on earlier days. Returns count of newly added articles."""
+    if date is None:
+        date = datetime.now()
+    if config.CROSS_DAY_DEDUP:
+        seen = get_seen_index()
+        new_articles = [a for a in new_articles if not seen.seen_before(agent_name, a["link"], date)]
+    added = get_backend().add_articles(agent_name, new_articles, date)
+    if config.CROSS_DAY_DEDUP:
+        seen.mark(agent_name, [a["link"] for a in new_articles], date)
+    if config.SEARCH_INDEX and added:
+        get_search_index().add(agent_name, new_articles, date)
+    return added
+
+
+def load_range(agent_name: str, start: datetime, end: datetime | None = None) -> list[dict]:
+    """Load an agent's articles for every day from start to end (default today),
+    inclusive, reading expired days back from the archive."""
+    if end is None:
+        end = datetime.now()
+    archived = get_archive().days(agent_name, start, end)
+    if not archived:
+        return get_backend().load_range(agent_name, start, end)
+    # Archived days all precede the days still in the backend
+    hot_start = datetime.strptime(archived[-1], "%Y-%m-%d") + timedelta(days=1)
+    return get_archive().load_range(agent_name, start, end) + get_backend().load_range(agent_name, hot_start, end)
+
+
+def cleanup_old_files(agent_name: str | None = None):
+    """Move items older than STORAGE_RETENTION_DAYS into the archive (with
+    ARCHIVE, otherwise remove them), drop archived months past
+    ARCHIVE_RETENTION_DAYS and expire the seen-link index."""
+    cutoff = datetime.now() - timedelta(days=config.STORAGE_RETENTION_DAYS)
+    backend = get_backend()
+    if config.CROSS_DAY_DEDUP:
+        get_seen_index().expire()
+    # Searchable history ends where the stored history does
+    if config.SEARCH_INDEX and not config.ARCHIVE:
+        get_search_index().prune(agent_name, cutoff)
+    if config.ARCHIVE:
+        archive = get_archive()
+        try:
+            for agent, day in backend.stored_days(agent_name):
+                if day < cutoff:
+                    archive.archive_day(agent, day, backend.load_articles(agent, day))
+                    print(f"  Archived: {agent}/{day:%Y-%m-%d}")
+        except (OSError, ValueError) as e:
+            # Nothing is deleted until its day is safely archived
+            print(f"  Error archiving old items, keeping them: {e}")
+            return
+        if config.ARCHIVE_RETENTION_DAYS:
+            archive_cutoff = datetime.now() - timedelta(days=config.ARCHIVE_RETENTION_DAYS)
+            archive.expire(agent_name, archive_cutoff)
+            if config.SEARCH_INDEX:
+                # Archives expire by whole month, up to the month of the cutoff
+                get_search_index().prune(agent_name, archive_cutoff.replace(day=1) - timedelta(days=1))
+    backend.cleanup_old_files(agent_name, cutoff)
+
+
+def compact(agent_name: str | None = None):
+    """Compact stored items (for jsonl: fold legacy JSON day files, drop torn lines)."""
+    get_backend().compact(agent_name)
@@ -0,0 +1,142 @@
+import gzip
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+import config
+
+
+def _day(date: datetime) -> str:
+    return date.strftime("%Y-%m-%d")
+
+
+def _months(start: datetime, end: datetime) -> list[str]:
+    months = []
+    month = start.replace(day=1)
+    while month.date() <= end.date():
+        months.append(month.strftime("%Y-%m"))
+        month = (month + timedelta(days=32)).replace(day=1)
+    return months
+
+
+class ItemArchive:
+    """Compressed monthly archive of expired days: data/archive/<agent>/YYYY-MM.jsonl.gz.
+
+    Each archived day is one gzip member of JSON lines appended to its
+    month's file, and YYYY-MM.idx.json maps the day to that member's offset,
+    length and item count. Reading a date range seeks to and decompresses
+    only the members it covers; `gzip -dc` still reads a whole month.
+    """
+
+    def __init__(self, root: str | None = None):
+        self.root = root or os.path.join(config.DATA_DIR, "archive")
+        self._lock = threading.Lock()
+
+    def _paths(self, agent_name: str, month: str) -> tuple[str, str]:
+        d = os.path.join(self.root, agent_name)
+        return os.path.join(d, f"{month}.jsonl.gz"), os.path.join(d, f"{month}.idx.json")
+
+    def _index(self, agent_name: str, month: str) -> dict[str, dict]:
+        try:
+            with open(self._paths(agent_name, month)[1], "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def days(self, agent_name: str, start: datetime, end: datetime) -> list[str]:
+        """Archived days from start to end, inclusive, oldest first."""
+        first, last = _day(start), _day(end)
+        return [
+            day for month in _months(start, end) for day in sorted(self._index(agent_name, month))
+            if first <= day <= last
+        ]
+
+    def day_entry(self, agent_name: str, date: datetime) -> dict | None:
+        """The index entry (offset, length, items) of an archived day, None if not archived."""
+        return self._index(agent_name, date.strftime("%Y-%m")).get(_day(date))
+
+    def stored_days(self, agent_name: str | None = None) -> list[tuple[str, datetime]]:
+        """(agent, day) of every archived day, oldest first."""
+        if not os.path.isdir(self.root):
+            return []
+        days = []
+        for agent in [agent_name] if agent_name else sorted(os.listdir(self.root)):
+            d = os.path.join(self.root, agent)
+            if not os.path.isdir(d):
+                continue
+            for filename in os.listdir(d):
+                if filename.endswith(".idx.json"):
+                    month = filename[: -len(".idx.json")]
+                    days += [(agent, datetime.strptime(day, "%Y-%m-%d")) for day in self._index(agent, month)]
+        return sorted(days, key=lambda entry: (entry[1], entry[0]))
+
+    def archive_day(self, agent_name: str, date: datetime, items: list[dict]):
+        """Append one day's items to its monthly archive. Archiving a day
+        again merges the new items into it (by link)."""
+        if not items:
+            return
+        day, month = _day(date), date.strftime("%Y-%m")
+        data_path, index_path = self._paths(agent_name, month)
+        with self._lock:
+            index = self._index(agent_name, month)
+            if day in index:
+                known = self._read_member(data_path, index[day])
+                links = {item["link"] for item in known}
+                items = known + [item for item in items if item["link"] not in links]
+            member = gzip.compress(
+                "".join(json.dumps(item, ensure_ascii=False, default=str) + "\n" for item in items).encode("utf-8"),
+                compresslevel=config.ARCHIVE_COMPRESSLEVEL,
+                mtime=0,
+            )
+            # Bytes past the last indexed member are a torn append from a killed run
+            end = max((entry["offset"] + entry["length"] for entry in index.values()), default=0)
+            os.makedirs(os.path.dirname(data_path), exist_ok=True)
+            with open(data_path, "r+b" if os.path.exists(data_path) else "wb") as f:
+                f.seek(end)
+                f.truncate()
+                f.write(member)
+                f.flush()
+                os.fsync(f.fileno())
+            # A day archived twice leaves its old member in place, unreferenced
+            index[day] = {"offset": end, "length": len(member), "items": len(items)}
+            tmp = index_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(dict(sorted(index.items())), f, indent=1)
+            os.replace(tmp, index_path)
+
+    @staticmethod
+    def _read_member(data_path: str, entry: dict) -> list[dict]:
+        with open(data_path, "rb") as f:
+            f.seek(entry["offset"])
+            raw = gzip.decompress(f.read(entry["length"]))
+        return [json.loads(line) for line in raw.decode("utf-8").splitlines() if line]
+
+    def load_range(self, agent_name: str, start: datetime, end: datetime) -> list[dict]:
+        """Archived items from start to end, inclusive, oldest day first."""
+        first, last = _day(start), _day(end)
+        items = []
+        for month in _months(start, end):
+            index = self._index(agent_name, month)
+            data_path = self._paths(agent_name, month)[0]
+            for day in sorted(index):
+                if first <= day <= last:
+                    items.extend(self._read_member(data_path, index[day]))
+        return items
+
+    def expire(self, agent_name: str | None, cutoff: datetime):
+        """Delete monthly archives whose whole month is before the cutoff."""
+        if not os.path.isdir(self.root):
+            return
+        keep_from = cutoff.strftime("%Y-%m")
+        agents = [agent_name] if agent_name else sorted(os.listdir(self.root))
+        with self._lock:
+            for agent in agents:
+                d = os.path.join(self.root, agent)
+                if not os.path.isdir(d):
+                    continue
+                for filename in sorted(os.listdir(d)):
+                    month = filename.split(".", 1)[0]
+                    if filename.endswith((".jsonl.gz", ".idx.json")) and month < keep_from:
+                        os.remove(os.path.join(d, filename))
+                        print(f"  Expired archive: {agent}/{filename}")
@@ -0,0 +1,46 @@
+import abc
+from collections.abc import Iterator
+from datetime import datetime
+
+
+class StorageBackend(abc.ABC):
+    """Base class for item stores. Items are grouped per agent and per day."""
+
+    @abc.abstractmethod
+    def load_articles(self, agent_name: str, date: datetime) -> list[dict]:
+        """Return the agent's items for one day, in insertion order."""
+
+    def iter_articles(self, agent_name: str, date: datetime) -> Iterator[dict]:
+        """Yield the agent's items for one day. Backends that can stream override this."""
+        yield from self.load_articles(agent_name, date)
+
+    @abc.abstractmethod
+    def save_articles(self, agent_name: str, articles: list[dict], date: datetime):
+        """Replace the agent's items for one day."""
+
+    @abc.abstractmethod
+    def add_articles(self, agent_name: str, new_articles: list[dict], date: datetime) -> int:
+        """Add items, deduplicating by link. Returns count of newly added items."""
+
+    @abc.abstractmethod
+    def load_range(self, agent_name: str, start: datetime, end: datetime) -> list[dict]:
+        """Return the agent's items for every day from start to end, inclusive."""
+
+    @abc.abstractmethod
+    def day_version(self, agent_name: str, date: datetime) -> str:
+        """A cheap token that changes whenever the agent's items for the day change."""
+
+    @abc.abstractmethod
+    def stored_days(self, agent_name: str | None) -> list[tuple[str, datetime]]:
+        """(agent, day) pairs that hold stored items (all agents when agent_name is None)."""
+
+    def has_day(self, agent_name: str, date: datetime) -> bool:
+        """True if the agent has stored items for the day."""
+        return any(day.date() == date.date() for _, day in self.stored_days(agent_name))
+
+    @abc.abstractmethod
+    def cleanup_old_files(self, agent_name: str | None, cutoff: datetime):
+        """Drop items from days before the cutoff (all agents when agent_name is None)."""
+
+    def compact(self, agent_name: str | None = None):
+        """Rewrite stored data into its most compact form. No-op unless overridden."""
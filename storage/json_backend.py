@@ -0,0 +1,121 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import config
+from storage.base_backend import StorageBackend
+
+
+def _ensure_dir(path: str):
+    os.makedirs(path, exist_ok=True)
+
+
+def agent_data_dir(agent_name: str) -> str:
+    return os.path.join(config.DATA_DIR, agent_name)
+
+
+def _filepath_for_date(agent_name: str, date: datetime) -> str:
+    d = agent_data_dir(agent_name)
+    return os.path.join(d, f"items_{date.strftime('%Y-%m-%d')}.json")
+
+
+def _agent_dirs(agent_name: str | None) -> list[str]:
+    if agent_name:
+        return [agent_data_dir(agent_name)]
+    _ensure_dir(config.DATA_DIR)
+    dirs = []
+    for entry in os.listdir(config.DATA_DIR):
+        full = os.path.join(config.DATA_DIR, entry)
+        if os.path.isdir(full):
+            dirs.append(full)
+    return dirs
+
+
+def day_files(agent_name: str | None, extensions: tuple[str, ...]) -> list[tuple[str, datetime]]:
+    """(agent, day) of every items_YYYY-MM-DD<ext> file, oldest day first."""
+    days = set()
+    for d in _agent_dirs(agent_name):
+        if not os.path.isdir(d):
+            continue
+        for filename in os.listdir(d):
+            stem, ext = os.path.splitext(filename)
+            if ext not in extensions or not stem.startswith("items_"):
+                continue
+            try:
+                days.add((os.path.basename(d), datetime.strptime(stem[len("items_"):], "%Y-%m-%d")))
+            except ValueError:
+                continue
+    return sorted(days, key=lambda entry: (entry[1], entry[0]))
+
+
+def file_version(*paths: str) -> str:
+    """Modification time and size of each file ("-" if missing)."""
+    parts = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+        except FileNotFoundError:
+            parts.append("-")
+    return "/".join(parts)
+
+
+class JsonBackend(StorageBackend):
+    """One indented JSON array per agent per day: data/<agent>/items_YYYY-MM-DD.json."""
+
+    def load_articles(self, agent_name: str, date: datetime) -> list[dict]:
+        path = _filepath_for_date(agent_name, date)
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_articles(self, agent_name: str, articles: list[dict], date: datetime):
+        d = agent_data_dir(agent_name)
+        _ensure_dir(d)
+        path = _filepath_for_date(agent_name, date)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(articles, f, indent=2, ensure_ascii=False, default=str)
+
+    def add_articles(self, agent_name: str, new_articles: list[dict], date: datetime) -> int:
+        existing = self.load_articles(agent_name, date)
+        existing_urls = {a["link"] for a in existing}
+        added = 0
+        for article in new_articles:
+            if article["link"] not in existing_urls:
+                existing.append(article)
+                existing_urls.add(article["link"])
+                added += 1
+        if added > 0:
+            self.save_articles(agent_name, existing, date)
+        return added
+
+    def load_range(self, agent_name: str, start: datetime, end: datetime) -> list[dict]:
+        items = []
+        day = start
+        while day.date() <= end.date():
+            items.extend(self.load_articles(agent_name, day))
+            day += timedelta(days=1)
+        return items
+
+    def day_version(self, agent_name: str, date: datetime) -> str:
+        return file_version(_filepath_for_date(agent_name, date))
+
+    def stored_days(self, agent_name: str | None) -> list[tuple[str, datetime]]:
+        return day_files(agent_name, (".json",))
+
+    def cleanup_old_files(self, agent_name: str | None, cutoff: datetime):
+        for d in _agent_dirs(agent_name):
+            if not os.path.isdir(d):
+                continue
+            for filename in os.listdir(d):
+                if not filename.startswith("items_") or not filename.endswith(".json"):
+                    continue
+                try:
+                    date_str = filename.replace("items_", "").replace(".json", "")
+                    file_date = datetime.strptime(date_str, "%Y-%m-%d")
+                    if file_date < cutoff:
+                        os.remove(os.path.join(d, filename))
+                        print(f"  Cleaned up: {os.path.basename(d)}/{filename}")
+                except ValueError:
+                    continue
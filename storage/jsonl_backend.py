@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+from storage.base_backend import StorageBackend
+from storage.json_backend import _agent_dirs, _ensure_dir, _filepath_for_date, agent_data_dir, day_files, file_version
+
+DIGEST_SIZE = 8
+
+
+def _day_path(agent_name: str, date: datetime, prefix: str, ext: str) -> str:
+    return os.path.join(agent_data_dir(agent_name), f"{prefix}_{date.strftime('%Y-%m-%d')}{ext}")
+
+
+def _link_digest(link: str) -> bytes:
+    return hashlib.blake2b(link.encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+def _dump_line(article: dict) -> str:
+    return json.dumps(article, ensure_ascii=False, default=str) + "\n"
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _read_lines(path: str) -> Iterator[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Torn last line from a killed run
+                continue
+
+
+class JsonlBackend(StorageBackend):
+    """Append-only JSON lines per agent per day: data/<agent>/items_YYYY-MM-DD.jsonl.
+
+    Each day has a sidecar links_YYYY-MM-DD.idx holding an 8-byte hash per
+    stored link, so dedup never has to read the items themselves and a batch
+    costs one append to each file.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._link_sets: dict[str, set[bytes]] = {}
+
+    def _paths(self, agent_name: str, date: datetime) -> tuple[str, str]:
+        return _day_path(agent_name, date, "items", ".jsonl"), _day_path(agent_name, date, "links", ".idx")
+
+    def _links(self, agent_name: str, date: datetime) -> set[bytes]:
+        items_path, idx_path = self._paths(agent_name, date)
+        links = self._link_sets.get(idx_path)
+        if links is not None:
+            return links
+        if os.path.exists(idx_path):
+            with open(idx_path, "rb") as f:
+                raw = f.read()
+            links = {raw[i:i + DIGEST_SIZE] for i in range(0, len(raw) - DIGEST_SIZE + 1, DIGEST_SIZE)}
+        elif os.path.exists(items_path):
+            links = {_link_digest(a["link"]) for a in _read_lines(items_path)}
+            with open(idx_path, "wb") as f:
+                f.write(b"".join(links))
+        else:
+            links = set()
+        self._link_sets[idx_path] = links
+        return links
+
+    def _write_day(self, agent_name: str, articles: list[dict], date: datetime):
+        """Atomically replace a day's items and link index."""
+        _ensure_dir(agent_data_dir(agent_name))
+        items_path, idx_path = self._paths(agent_name, date)
+        links = set()
+        unique = []
+        for article in articles:
+            digest = _link_digest(article["link"])
+            if digest not in links:
+                links.add(digest)
+                unique.append(article)
+        for path, data, mode in (
+            (items_path, "".join(_dump_line(a) for a in unique), "w"),
+            (idx_path, b"".join(_link_digest(a["link"]) for a in unique), "wb"),
+        ):
+            tmp = path + ".tmp"
+            with open(tmp, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+                f.write(data)
+            os.replace(tmp, path)
+        self._link_sets[idx_path] = links
+
+    def _fold_legacy(self, agent_name: str, date: datetime) -> bool:
+        """Merge a legacy items_YYYY-MM-DD.json day file into the JSONL day. Returns True if one existed."""
+        legacy = _filepath_for_date(agent_name, date)
+        if not os.path.exists(legacy):
+            return False
+        with open(legacy, "r", encoding="utf-8") as f:
+            articles = json.load(f)
+        items_path, _ = self._paths(agent_name, date)
+        if os.path.exists(items_path):
+            articles += list(_read_lines(items_path))
+        self._write_day(agent_name, articles, date)
+        os.remove(legacy)
+        return True
+
+    def iter_articles(self, agent_name: str, date: datetime) -> Iterator[dict]:
+        items_path, _ = self._paths(agent_name, date)
+        if os.path.exists(_filepath_for_date(agent_name, date)):
+            with self._lock:
+                self._fold_legacy(agent_name, date)
+        if os.path.exists(items_path):
+            yield from _read_lines(items_path)
+
+    def load_articles(self, agent_name: str, date: datetime) -> list[dict]:
+        return list(self.iter_articles(agent_name, date))
+
+    def save_articles(self, agent_name: str, articles: list[dict], date: datetime):
+        with self._lock:
+            self._write_day(agent_name, articles, date)
+            legacy = _filepath_for_date(agent_name, date)
+            if os.path.exists(legacy):
+                os.remove(legacy)
+
+    def add_articles(self, agent_name: str, new_articles: list[dict], date: datetime) -> int:
+        with self._lock:
+            self._fold_legacy(agent_name, date)
+            links = self._links(agent_name, date)
+            lines = []
+            digests = []
+            for article in new_articles:
+                digest = _link_digest(article["link"])
+                if digest in links:
+                    continue
+                links.add(digest)
+                digests.append(digest)
+                lines.append(_dump_line(article))
+            if not lines:
+                return 0
+            _ensure_dir(agent_data_dir(agent_name))
+            items_path, idx_path = self._paths(agent_name, date)
+            # Items first: a crash in between can only cause a duplicate, never a lost item
+            with open(items_path, "ab") as f:
+                if f.tell() and not _ends_with_newline(items_path):
+                    lines.insert(0, "\n")
+                f.write("".join(lines).encode("utf-8"))
+            with open(idx_path, "ab") as f:
+                f.write(b"".join(digests))
+            return len(digests)
+
+    def load_range(self, agent_name: str, start: datetime, end: datetime) -> list[dict]:
+        items = []
+        day = start
+        while day.date() <= end.date():
+            items.extend(self.iter_articles(agent_name, day))
+            day += timedelta(days=1)
+        return items
+
+    def day_version(self, agent_name: str, date: datetime) -> str:
+        return file_version(self._paths(agent_name, date)[0], _filepath_for_date(agent_name, date))
+
+    def stored_days(self, agent_name: str | None) -> list[tuple[str, datetime]]:
+        # Legacy JSON day files count until they are folded in
+        return day_files(agent_name, (".jsonl", ".json"))
+
+    def cleanup_old_files(self, agent_name: str | None, cutoff: datetime):
+        for d in _agent_dirs(agent_name):
+            if not os.path.isdir(d):
+                continue
+            for filename in os.listdir(d):
+                stem, ext = os.path.splitext(filename)
+                if ext not in (".jsonl", ".idx", ".json") or "_" not in stem:
+                    continue
+                try:
+                    file_date = datetime.strptime(stem.split("_", 1)[1], "%Y-%m-%d")
+                except ValueError:
+                    continue
+                if file_date < cutoff:
+                    path = os.path.join(d, filename)
+                    os.remove(path)
+                    self._link_sets.pop(path, None)
+                    print(f"  Cleaned up: {os.path.basename(d)}/{filename}")
+
+    def compact(self, agent_name: str | None = None):
+        for d in _agent_dirs(agent_name):
+            if not os.path.isdir(d):
+                continue
+            agent = os.path.basename(d)
+            for filename in sorted(os.listdir(d)):
+                if not filename.startswith("items_") or not filename.endswith((".json", ".jsonl")):
+                    continue
+                try:
+                    date = datetime.strptime(os.path.splitext(filename)[0][len("items_"):], "%Y-%m-%d")
+                except ValueError:
+                    continue
+                with self._lock:
+                    if filename.endswith(".json"):
+                        self._fold_legacy(agent, date)
+                        print(f"  Compacted: {agent}/{filename}")
+                    else:
+                        # Drops torn lines and duplicates left by interrupted appends
+                        self._write_day(agent, list(_read_lines(os.path.join(d, filename))), date)
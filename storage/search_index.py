@@ -0,0 +1,140 @@
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id    INTEGER PRIMARY KEY,
+    agent TEXT NOT NULL,
+    link  TEXT NOT NULL,
+    day   TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS docs_agent_link ON docs (agent, link);
+CREATE INDEX IF NOT EXISTS docs_day ON docs (day);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    title, summary, source, agent, tokenize = "unicode61 remove_diacritics 2"
+);
+"""
+
+_TOKEN = re.compile(r"\w+\*?")
+
+
+@dataclass
+class SearchHit:
+    agent: str
+    day: str
+    title: str
+    link: str
+    source: str
+    score: float
+
+
+def _fields(agent_name: str, item: dict) -> tuple[str, str, str, str]:
+    # GitHub repos carry name/description instead of title/summary
+    return (
+        item.get("title") or item.get("name") or "",
+        item.get("summary") or item.get("description") or "",
+        item.get("source") or "",
+        agent_name,
+    )
+
+
+def match_expression(query: str) -> str:
+    """FTS5 MATCH expression for free text: every word must occur, "word*" matches a prefix.
+    Punctuation is ignored, so user input can't produce an FTS syntax error."""
+    terms = []
+    for token in _TOKEN.findall(query):
+        word, star = token.rstrip("*"), token.endswith("*")
+        terms.append(f'"{word}"' + ("*" if star else ""))
+    return " ".join(terms)
+
+
+class SearchIndex:
+    """Incremental full-text index over every collected item: data/search.sqlite3.
+
+    An SQLite FTS5 table over title, summary, source and agent, plus one
+    docs row per (agent, link) recording the day it was collected. Items are
+    indexed as storage adds them, so queries never touch the day files.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(config.DATA_DIR, "search.sqlite3")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.created = not os.path.exists(self.path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def add(self, agent_name: str, items: list[dict], date: datetime) -> int:
+        """Index items under `date`. An item already indexed (by agent and link)
+        moves to this day with its current text. Returns count newly indexed."""
+        day = date.strftime("%Y-%m-%d")
+        added = 0
+        with self._lock, self._conn:
+            for item in items:
+                replaced = self._conn.execute(
+                    "DELETE FROM docs_fts WHERE rowid = (SELECT id FROM docs WHERE agent = ? AND link = ?)",
+                    (agent_name, item["link"]),
+                ).rowcount
+                # A re-indexed item also gets a fresh id, so version() changes
+                (doc_id,) = self._conn.execute(
+                    "INSERT INTO docs (agent, link, day) VALUES (?, ?, ?)"
+                    " ON CONFLICT (agent, link) DO UPDATE SET day = excluded.day, id = (SELECT MAX(id) + 1 FROM docs)"
+                    " RETURNING id",
+                    (agent_name, item["link"], day),
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT INTO docs_fts (rowid, title, summary, source, agent) VALUES (?, ?, ?, ?, ?)",
+                    (doc_id, *_fields(agent_name, item)),
+                )
+                added += not replaced
+        return added
+
+    def search(self, query: str, limit: int | None = None, agent_name: str | None = None) -> list[SearchHit]:
+        """Best-matching items across all agents and days, by BM25 (title hits weigh TITLE_WEIGHT)."""
+        expression = match_expression(query)
+        if not expression:
+            return []
+        sql = (
+            "SELECT d.agent, d.day, f.title, d.link, f.source, bm25(docs_fts, ?, 1.0, 0.5, 0.5) AS score"
+            " FROM docs_fts f JOIN docs d ON d.id = f.rowid WHERE docs_fts MATCH ?"
+        )
+        params: list = [config.TITLE_WEIGHT, expression]
+        if agent_name:
+            sql += " AND d.agent = ?"
+            params.append(agent_name)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit or config.SEARCH_LIMIT)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        # FTS5's bm25() is negative, best first; report it as a positive score
+        return [SearchHit(agent, day, title, link, source, -score) for agent, day, title, link, source, score in rows]
+
+    def prune(self, agent_name: str | None, cutoff: datetime) -> int:
+        """Forget items collected on the cutoff's day or earlier, the days the
+        storage backends expire for the same cutoff. Returns count removed."""
+        where = "day <= ?"
+        params: tuple = (cutoff.strftime("%Y-%m-%d"),)
+        if agent_name:
+            where += " AND agent = ?"
+            params += (agent_name,)
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM docs_fts WHERE rowid IN (SELECT id FROM docs WHERE {where})", params)
+            return self._conn.execute(f"DELETE FROM docs WHERE {where}", params).rowcount
+
+    def version(self) -> str:
+        """A token that changes whenever items are indexed or pruned."""
+        with self._lock:
+            count, last_id = self._conn.execute("SELECT COUNT(*), MAX(id) FROM docs").fetchone()
+        return f"{count}:{last_id}"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
@@ -0,0 +1,97 @@
+import hashlib
+import os
+import struct
+import threading
+from datetime import datetime
+
+import config
+
+# One record per (agent, link): 8-byte hash + ordinal of the day it was last collected
+RECORD = struct.Struct("<8sI")
+
+
+def _cutoff(date: datetime) -> int:
+    """Ordinal of the oldest day still within retention as of `date`."""
+    return date.toordinal() - config.STORAGE_RETENTION_DAYS
+
+
+def _key(agent_name: str, link: str) -> bytes:
+    return hashlib.blake2b(f"{agent_name}\n{link}".encode("utf-8"), digest_size=8).digest()
+
+
+class SeenIndex:
+    """Cross-day record of which links each agent has already collected.
+
+    Kept as an append-only file of fixed-size records in DATA_DIR. Entries
+    older than STORAGE_RETENTION_DAYS never count as seen. Loading only
+    reads the file, so parse worker processes can each load it safely; the
+    writing process compacts it (drops stale records and any torn tail) when
+    it next marks links or expires entries, once more than half is stale.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(config.DATA_DIR, "seen_links.idx")
+        self._lock = threading.Lock()
+        self._days: dict[bytes, int] = {}
+        # Records in the file, including stale and superseded ones
+        self._records = 0
+        # The file ends in a partial record (a killed append)
+        self._torn = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        usable = len(raw) - len(raw) % RECORD.size
+        cutoff = _cutoff(datetime.now())
+        for key, day in RECORD.iter_unpack(raw[:usable]):
+            self._records += 1
+            if day >= cutoff and day > self._days.get(key, 0):
+                self._days[key] = day
+        self._torn = usable != len(raw)
+
+    def _compact(self):
+        """Rewrite the file from memory if it is torn or more than half stale. Call with the lock held."""
+        if not self._torn and len(self._days) >= self._records // 2:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(b"".join(RECORD.pack(key, day) for key, day in self._days.items()))
+        os.replace(tmp, self.path)
+        self._records = len(self._days)
+        self._torn = False
+
+    def expire(self, date: datetime | None = None):
+        """Drop entries past retention as of `date` (default now), compacting
+        the file if needed. Long-running processes call this periodically."""
+        cutoff = _cutoff(date or datetime.now())
+        with self._lock:
+            self._days = {key: day for key, day in self._days.items() if day >= cutoff}
+            if os.path.exists(self.path):
+                self._compact()
+
+    def seen_before(self, agent_name: str, link: str, date: datetime) -> bool:
+        """True if the agent collected the link on a day before `date`, within retention."""
+        day = self._days.get(_key(agent_name, link))
+        return day is not None and _cutoff(date) <= day < date.toordinal()
+
+    def mark(self, agent_name: str, links: list[str], date: datetime):
+        day = date.toordinal()
+        with self._lock:
+            # Appending after a torn tail would misalign every later record
+            self._compact()
+            records = []
+            for link in links:
+                key = _key(agent_name, link)
+                if self._days.get(key, 0) < day:
+                    self._days[key] = day
+                    records.append(RECORD.pack(key, day))
+            if not records:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(b"".join(records))
+            self._records += len(records)
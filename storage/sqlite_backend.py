@@ -0,0 +1,132 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import config
+from storage.base_backend import StorageBackend
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id    INTEGER PRIMARY KEY,
+    agent TEXT NOT NULL,
+    day   TEXT NOT NULL,
+    link  TEXT NOT NULL,
+    data  TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS items_agent_day_link ON items (agent, day, link);
+CREATE TABLE IF NOT EXISTS day_generations (
+    agent      TEXT NOT NULL,
+    day        TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    PRIMARY KEY (agent, day)
+);
+"""
+
+
+def _day(date: datetime) -> str:
+    return date.strftime("%Y-%m-%d")
+
+
+class SqliteBackend(StorageBackend):
+    """All agents' items in one SQLite database: data/items.sqlite3.
+
+    Dedup is the unique (agent, day, link) index, so adding a batch is one
+    INSERT OR IGNORE transaction instead of a rewrite of the whole day.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(config.DATA_DIR, "items.sqlite3")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def _rows(agent_name: str, day: str, articles: list[dict]):
+        for article in articles:
+            yield agent_name, day, article["link"], json.dumps(article, ensure_ascii=False, default=str)
+
+    def load_articles(self, agent_name: str, date: datetime) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM items WHERE agent = ? AND day = ? ORDER BY id",
+                (agent_name, _day(date)),
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def save_articles(self, agent_name: str, articles: list[dict], date: datetime):
+        day = _day(date)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM items WHERE agent = ? AND day = ?", (agent_name, day))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO items (agent, day, link, data) VALUES (?, ?, ?, ?)",
+                self._rows(agent_name, day, articles),
+            )
+            # Re-inserted rows can reuse the deleted rows' ids, so count rewrites explicitly
+            self._conn.execute(
+                "INSERT INTO day_generations (agent, day, generation) VALUES (?, ?, 1)"
+                " ON CONFLICT (agent, day) DO UPDATE SET generation = generation + 1",
+                (agent_name, day),
+            )
+
+    def add_articles(self, agent_name: str, new_articles: list[dict], date: datetime) -> int:
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO items (agent, day, link, data) VALUES (?, ?, ?, ?)",
+                self._rows(agent_name, _day(date), new_articles),
+            )
+            return self._conn.total_changes - before
+
+    def load_range(self, agent_name: str, start: datetime, end: datetime) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM items WHERE agent = ? AND day BETWEEN ? AND ? ORDER BY day, id",
+                (agent_name, _day(start), _day(end)),
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def day_version(self, agent_name: str, date: datetime) -> str:
+        # Added items raise the highest id; rewrites bump the day's generation
+        with self._lock:
+            count, last_id = self._conn.execute(
+                "SELECT COUNT(*), MAX(id) FROM items WHERE agent = ? AND day = ?", (agent_name, _day(date))
+            ).fetchone()
+            row = self._conn.execute(
+                "SELECT generation FROM day_generations WHERE agent = ? AND day = ?", (agent_name, _day(date))
+            ).fetchone()
+        return f"{count}:{last_id}:{row[0] if row else 0}"
+
+    def has_day(self, agent_name: str, date: datetime) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM items WHERE agent = ? AND day = ? LIMIT 1", (agent_name, _day(date))
+            ).fetchone()
+        return row is not None
+
+    def stored_days(self, agent_name: str | None) -> list[tuple[str, datetime]]:
+        query = "SELECT DISTINCT agent, day FROM items"
+        params: tuple = ()
+        if agent_name:
+            query += " WHERE agent = ?"
+            params = (agent_name,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY day, agent", params).fetchall()
+        return [(agent, datetime.strptime(day, "%Y-%m-%d")) for agent, day in rows]
+
+    def cleanup_old_files(self, agent_name: str | None, cutoff: datetime):
+        # A day is expired once its midnight is before the cutoff, as with the JSON files
+        where = "day <= ?"
+        params: tuple = (_day(cutoff),)
+        if agent_name:
+            where += " AND agent = ?"
+            params += (agent_name,)
+        with self._lock, self._conn:
+            removed = self._conn.execute(f"DELETE FROM items WHERE {where}", params).rowcount
+            self._conn.execute(f"DELETE FROM day_generations WHERE {where}", params)
+        if removed:
+            print(f"  Cleaned up: {removed} items{' from ' + agent_name if agent_name else ''} before {_day(cutoff)}")
@@ -0,0 +1,49 @@
+import json
+import os
+from dataclasses import dataclass, field
+
+import config
+from keywords import KeywordMatcher
+
+
+@dataclass
+class Subscription:
+    """One recipient's digest: which sections they get and, optionally, the
+    keywords an item's title or summary must mention to be included."""
+
+    email: str
+    sections: list[str] | None = None
+    keywords: list[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._matcher = KeywordMatcher(self.keywords, boundary="word") if self.keywords else None
+
+    def wants_section(self, agent_name: str) -> bool:
+        return self.sections is None or agent_name in self.sections
+
+    def wants_item(self, item: dict) -> bool:
+        if self._matcher is None:
+            return True
+        text = " ".join((
+            item.get("title", item.get("name", "")),
+            item.get("summary", item.get("description", "")),
+        ))
+        return self._matcher.matches(text)
+
+
+def load_subscriptions(path: str | None = None) -> list[Subscription]:
+    """Read the subscriptions file, falling back to RECIPIENT_EMAIL getting everything."""
+    if path is None:
+        path = config.SUBSCRIPTIONS_FILE
+    if not os.path.exists(path):
+        return [Subscription(config.RECIPIENT_EMAIL)] if config.RECIPIENT_EMAIL else []
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    return [
+        Subscription(
+            email=entry["email"],
+            sections=entry.get("sections"),
+            keywords=entry.get("keywords", []),
+        )
+        for entry in entries
+    ]
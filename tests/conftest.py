@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point config.DATA_DIR (and so every storage singleton) at a fresh directory."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path / "data"))
+    return config.DATA_DIR
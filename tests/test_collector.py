@@ -0,0 +1,37 @@
+import asyncio
+import os
+
+import collector
+from agents.base_agent import BaseAgent
+from fetcher import FetchResult
+
+
+class _CrashingAgent(BaseAgent):
+    """Parses b"crash" by killing the worker process it runs in."""
+
+    def get_agent_name(self) -> str:
+        return "test"
+
+    def get_sources(self) -> list[dict]:
+        return []
+
+    def parse_source(self, source: dict, body: bytes) -> list[dict]:
+        if body == b"crash":
+            os._exit(1)
+        return [{"title": body.decode(), "link": source["url"]}]
+
+
+def test_parse_stage_replaces_a_broken_process_pool():
+    async def run():
+        agent = _CrashingAgent()
+        fetched, parsed = asyncio.Queue(), asyncio.Queue()
+        for name, body in (("bad", b"crash"), ("good", b"fine")):
+            await fetched.put((agent, {"name": name, "url": f"https://example.com/{name}"}, FetchResult("", 200, body)))
+        await fetched.put(collector._DONE)
+        with collector.ParsePool(1) as pool:
+            first = pool.executor
+            await collector._parse_stage(fetched, parsed, pool, None, None)
+            assert pool.executor is not first
+        return [source["name"] for _, source, _, _ in (parsed.get_nowait() for _ in range(parsed.qsize()))]
+
+    assert asyncio.run(run()) == ["good"]
@@ -0,0 +1,19 @@
+import numpy as np
+
+import config
+import dedup
+
+
+def test_near_duplicates_behind_a_dissimilar_bucket_member_are_merged():
+    rows = config.MINHASH_PERMUTATIONS // config.LSH_BANDS
+    n = config.MINHASH_PERMUTATIONS
+    first = np.arange(n, dtype=np.uint64) + 10_000
+    second = np.arange(n, dtype=np.uint64)
+    # Three of every band's rows agree with `second`, so no band but the first matches in full
+    third = second.copy()
+    third[rows - 1::rows] += 50_000
+    third[:rows] = second[:rows]
+    # The dissimilar item shares only that first band, and comes first in its bucket
+    first[:rows] = second[:rows]
+    items = [{"title": str(i), "link": f"https://example.com/{i}"} for i in range(3)]
+    assert dedup.cluster_near_duplicates(items, [first, second, third]) == [[0], [1, 2]]
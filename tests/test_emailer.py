@@ -0,0 +1,94 @@
+import socket
+
+import pytest
+from aiosmtpd.controller import Controller
+
+import config
+import emailer
+
+
+class _Handler:
+    """Accept mail, except: the first RCPT for each address in `defer` gets a
+    451, and every RCPT for an address in `reject` gets a 550."""
+
+    def __init__(self, defer=(), reject=()):
+        self.defer = set(defer)
+        self.reject = set(reject)
+        self.messages = []
+        self.attempts: dict[str, int] = {}
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        self.attempts[address] = self.attempts.get(address, 0) + 1
+        if address in self.reject:
+            return "550 5.1.1 No such user"
+        if address in self.defer:
+            self.defer.discard(address)
+            return "451 4.3.0 Try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 Message accepted"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    def start(**kwargs):
+        handler = _Handler(**kwargs)
+        controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+        controller.start()
+        started.append(controller)
+        monkeypatch.setattr(config, "SMTP_SERVER", controller.hostname)
+        monkeypatch.setattr(config, "SMTP_PORT", controller.port)
+        return handler
+
+    started = []
+    monkeypatch.setattr(config, "SMTP_STARTTLS", False)
+    monkeypatch.setattr(config, "SMTP_LOGIN", False)
+    monkeypatch.setattr(config, "GMAIL_ADDRESS", "digest@example.com")
+    monkeypatch.setattr(emailer.time, "sleep", lambda seconds: None)
+    yield start
+    for controller in started:
+        controller.stop()
+
+
+def test_transient_failure_is_retried(smtp):
+    handler = smtp(defer={"a@example.com"})
+    assert emailer.send_messages([("a@example.com", "Digest", "<p>hello</p>")]) == 1
+    assert [envelope.rcpt_tos for envelope in handler.messages] == [["a@example.com"]]
+    assert handler.attempts == {"a@example.com": 2}
+
+
+def test_permanent_failure_only_skips_that_recipient(smtp):
+    handler = smtp(reject={"gone@example.com"})
+    messages = [
+        ("a@example.com", "Digest", "<p>one</p>"),
+        ("gone@example.com", "Digest", "<p>two</p>"),
+        ("b@example.com", "Digest", "<p>three</p>"),
+    ]
+    assert emailer.send_messages(messages) == 2
+    assert [envelope.rcpt_tos for envelope in handler.messages] == [["a@example.com"], ["b@example.com"]]
+    # A 5xx is not retried
+    assert handler.attempts["gone@example.com"] == 1
+
+
+def test_long_html_lines_are_wrapped(smtp):
+    handler = smtp()
+    html_body = "<p>" + " ".join(f'<span class="badge">source {i}</span>' for i in range(200)) + "</p>"
+    assert emailer.send_messages([("a@example.com", "Digest", html_body)]) == 1
+    assert max(len(line) for line in handler.messages[0].content.splitlines()) <= 998
+
+
+def test_a_message_is_attempted_even_without_retries(smtp, monkeypatch):
+    monkeypatch.setattr(config, "SMTP_RETRIES", 0)
+    handler = smtp(defer={"a@example.com"})
+    assert emailer.send_messages([("a@example.com", "Digest", "<p>hello</p>")]) == 0
+    assert handler.attempts == {"a@example.com": 1}
+    assert emailer.send_messages([("a@example.com", "Digest", "<p>hello</p>")]) == 1
@@ -0,0 +1,42 @@
+import asyncio
+
+import config
+from fetcher import AsyncFetcher, FetchResult
+from httpcache import ValidatorStore
+
+
+class _Transport:
+    """Answers every request with an ETag, recording the headers it was sent."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def open(self, stats):
+        pass
+
+    async def close(self):
+        pass
+
+    async def get(self, url, headers=None):
+        self.sent.append(headers or {})
+        return FetchResult(url, 200, b"page", {"etag": '"v1"'})
+
+
+def test_validators_are_kept_per_agent(data_dir, monkeypatch):
+    monkeypatch.setattr(config, "HOST_MIN_INTERVAL", 0)
+    url = "https://example.com/shared"
+
+    async def run():
+        transport = _Transport()
+        async with AsyncFetcher(transport=transport, validators=ValidatorStore()) as fetcher:
+            grants = await fetcher.fetch(url, agent_name="grants")
+            await fetcher.fetch(url, agent_name="funding")
+            # Only grants stored its items
+            fetcher.remember(url, grants, "grants")
+            await fetcher.fetch(url, agent_name="grants")
+            await fetcher.fetch(url, agent_name="funding")
+        return transport.sent
+
+    sent = asyncio.run(run())
+    assert sent[2] == {"If-None-Match": '"v1"'}
+    assert sent[3] == {}
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+import formatter
+import storage
+
+DAY = datetime(2026, 3, 2)
+
+
+def _save_news(titles):
+    storage.save_articles("news", [
+        {"title": title, "link": f"https://example.com/{i}", "source": "Example", "summary": ""}
+        for i, title in enumerate(titles)
+    ], DAY)
+
+
+def test_iter_digest_keeps_no_rendered_items(data_dir):
+    _save_news(["First story", "Second story"])
+    digest = formatter.SharedDigest(DAY)
+    body = digest.body()
+    assert digest._fragments is None
+    assert "".join(formatter.iter_digest(DAY)) == body == formatter.format_digest(DAY)[1]
+
+
+def test_fan_out_renders_each_item_once(data_dir, monkeypatch):
+    _save_news(["First story", "Second story"])
+    rendered = []
+    render = formatter._render_article
+    monkeypatch.setattr(formatter, "_render_article", lambda item: rendered.append(item["link"]) or render(item))
+    digest = formatter.SharedDigest(DAY, cache_fragments=True)
+    assert digest.body() == digest.body()
+    assert len(rendered) == 2
+
+
+def test_subscription_filter_applies_before_section_cap(data_dir, monkeypatch):
+    import config
+    import subscriptions
+
+    monkeypatch.setattr(config, "RANKING", True)
+    monkeypatch.setattr(config, "SECTION_LIMITS", {"news": 2})
+    _save_news(["Generic story one", "Generic story two", "Generic story three", "Robotics arm update"])
+    digest = formatter.SharedDigest(DAY)
+    sub = subscriptions.Subscription("reader@example.com", keywords=["robotics"])
+    assert digest.item_count() == 2
+    assert digest.item_count(sub) == 1
+    assert "Robotics arm update" in digest.body(sub)
+    assert digest.item_count(subscriptions.Subscription("reader@example.com", keywords=["quantum"])) == 0
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+import emailer
+import main
+import storage
+import subscriptions
+
+
+def test_send_digests_reports_when_no_subscription_matches(data_dir, monkeypatch, capsys):
+    storage.save_articles("news", [
+        {"title": "Generic story", "link": "https://example.com/1", "source": "Example", "summary": ""},
+    ], datetime.now())
+    monkeypatch.setattr(subscriptions, "load_subscriptions", lambda: [
+        subscriptions.Subscription("reader@example.com", keywords=["quantum"]),
+    ])
+    monkeypatch.setattr(emailer, "send_messages", lambda messages: list(messages) and 1)
+
+    assert main.send_digests()
+    out = capsys.readouterr().out
+    assert "No digest sent" in out
+    assert "sent successfully" not in out
@@ -0,0 +1,18 @@
+import config
+import ranking
+from keywords import KeywordMatcher
+
+
+def test_findall_returns_configured_keyword_for_case_folded_characters():
+    matcher = KeywordMatcher(["artificial intelligence", "transformer"])
+    assert matcher.findall("ARTİFİCİAL İNTELLİGENCE and a tranſformer") == ["artificial intelligence", "transformer"]
+    assert matcher.search("Tranſformer") == "transformer"
+
+
+def test_rank_items_accepts_non_ascii_case_variants():
+    items = [
+        {"title": "Unrelated", "summary": "nothing here"},
+        {"title": "Yeni bir ARTİFİCİAL İNTELLİGENCE modeli", "summary": "tranſformer"},
+    ]
+    ranked = ranking.rank_items(items, config.AI_KEYWORDS)
+    assert ranked[0] is items[1]
@@ -0,0 +1,77 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+
+import pytest
+
+import config
+import server
+import storage
+
+OLD_DAY = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=40)
+
+
+@pytest.fixture
+def base_url(data_dir, monkeypatch):
+    monkeypatch.setattr(config, "SEARCH_INDEX", False)
+    httpd = server.DigestServer(("127.0.0.1", 0))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _get(url: str):
+    with urllib.request.urlopen(url) as response:
+        return response.status, response.headers["ETag"], response.read()
+
+
+def test_archived_day_is_served(base_url):
+    storage.get_archive().archive_day("news", OLD_DAY, [
+        {"title": "Archived story", "link": "https://example.com/a", "source": "Example", "summary": ""},
+    ])
+    day = OLD_DAY.strftime("%Y-%m-%d")
+    status, _, body = _get(f"{base_url}/api/items/news?date={day}")
+    assert status == 200
+    assert [item["title"] for item in json.loads(body)] == ["Archived story"]
+    status, _, body = _get(f"{base_url}/digest/{day}")
+    assert status == 200
+    assert b"Archived story" in body
+
+
+def test_unknown_past_day_is_not_found(base_url):
+    day = (OLD_DAY - timedelta(days=1)).strftime("%Y-%m-%d")
+    for path in (f"/digest/{day}", f"/api/items/news?date={day}"):
+        with pytest.raises(urllib.error.HTTPError) as e:
+            _get(base_url + path)
+        assert e.value.code == 404
+
+
+def test_etag_changes_when_a_day_is_archived(base_url):
+    item = {"title": "Story", "link": "https://example.com/s", "source": "Example", "summary": ""}
+    storage.save_articles("news", [item], OLD_DAY)
+    url = f"{base_url}/api/items/news?date={OLD_DAY:%Y-%m-%d}"
+    _, live_etag, _ = _get(url)
+    storage.get_archive().archive_day("news", OLD_DAY, [item, dict(item, link="https://example.com/t")])
+    _, etag, body = _get(url)
+    assert etag != live_etag
+    assert len(json.loads(body)) == 2
+
+
+@pytest.mark.parametrize("backend", sorted(storage.BACKENDS))
+def test_etag_changes_when_a_day_is_rewritten_with_as_many_items(base_url, monkeypatch, backend):
+    monkeypatch.setattr(config, "STORAGE_BACKEND", backend)
+    url = f"{base_url}/api/items/news?date={OLD_DAY:%Y-%m-%d}"
+    storage.save_articles("news", [
+        {"title": title, "link": f"https://example.com/{title}", "source": "Example", "summary": ""} for title in "ab"
+    ], OLD_DAY)
+    _, etag, _ = _get(url)
+    storage.save_articles("news", [
+        {"title": title, "link": f"https://example.com/{title}", "source": "Example", "summary": ""} for title in "cd"
+    ], OLD_DAY)
+    _, new_etag, body = _get(url)
+    assert new_etag != etag
+    assert [item["title"] for item in json.loads(body)] == ["c", "d"]
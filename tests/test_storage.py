@@ -0,0 +1,74 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import config
+import storage
+
+
+@pytest.mark.parametrize("backend", sorted(storage.BACKENDS))
+def test_cleanup_keeps_search_index_and_store_in_step(data_dir, monkeypatch, backend):
+    monkeypatch.setattr(config, "STORAGE_BACKEND", backend)
+    monkeypatch.setattr(config, "ARCHIVE", False)
+    monkeypatch.setattr(config, "SEARCH_INDEX", True)
+    today = datetime.now()
+    for offset in range(config.STORAGE_RETENTION_DAYS - 2, config.STORAGE_RETENTION_DAYS + 3):
+        day = today - timedelta(days=offset)
+        storage.save_articles("news", [
+            {"title": f"Story from {day:%Y-%m-%d}", "link": f"https://example.com/{offset}", "summary": ""},
+        ], day)
+
+    storage.cleanup_old_files("news")
+
+    stored = {f"{day:%Y-%m-%d}" for _, day in storage.get_backend().stored_days("news")}
+    indexed = {hit.day for hit in storage.search("story", limit=100)}
+    assert stored == indexed
+    assert 0 < len(stored) < 5
+
+
+def test_seen_index_expires_links_without_reloading(data_dir):
+    seen = storage.SeenIndex()
+    first = datetime(2026, 1, 1)
+    later = first + timedelta(days=config.STORAGE_RETENTION_DAYS + 1)
+    seen.mark("news", [f"https://example.com/{i}" for i in range(10)], first)
+    seen.mark("news", ["https://example.com/new"], later)
+    assert seen.seen_before("news", "https://example.com/0", first + timedelta(days=1))
+    assert not seen.seen_before("news", "https://example.com/0", later)
+
+    seen.expire(later)
+    assert len(seen._days) == 1
+    # The stale records were compacted out of the file too
+    assert os.path.getsize(seen.path) == storage.seen_index.RECORD.size
+
+
+def test_loading_the_seen_index_never_writes_it(data_dir):
+    seen = storage.SeenIndex()
+    seen.mark("news", ["https://example.com/a"], datetime.now())
+    with open(seen.path, "ab") as f:
+        f.write(b"torn")
+    before = os.stat(seen.path)
+
+    reader = storage.SeenIndex()
+    assert reader.seen_before("news", "https://example.com/a", datetime.now() + timedelta(days=1))
+    assert os.stat(seen.path).st_mtime_ns == before.st_mtime_ns
+    assert os.path.getsize(seen.path) == before.st_size
+
+    # The writer drops the torn tail before appending
+    reader.mark("news", ["https://example.com/b"], datetime.now())
+    assert os.path.getsize(seen.path) == 2 * storage.seen_index.RECORD.size
+    assert len(storage.SeenIndex()._days) == 2
+
+
+def test_search_index_follows_an_item_collected_again(data_dir):
+    index = storage.SearchIndex()
+    item = {"title": "Robotics arm", "link": "https://example.com/r", "summary": ""}
+    assert index.add("news", [item], datetime(2026, 1, 1)) == 1
+    version = index.version()
+    assert index.add("news", [dict(item, title="Robotics hand")], datetime(2026, 1, 5)) == 0
+    assert index.version() != version
+
+    assert [(hit.day, hit.title) for hit in index.search("robotics")] == [("2026-01-05", "Robotics hand")]
+    assert index.search("arm") == []
+    index.prune(None, datetime(2026, 1, 1))
+    assert len(index) == 1